@@ -7,6 +7,8 @@ from app.database import Base
 import app.models.user
 import app.models.course
 import app.models.enrollment
+import app.models.notification
+import app.models.upload
 
 # this is the Alembic Config object
 config = context.config
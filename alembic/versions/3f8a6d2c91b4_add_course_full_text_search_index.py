@@ -0,0 +1,38 @@
+"""add GIN full-text search index on courses
+
+Revision ID: 3f8a6d2c91b4
+Revises: 7d41c0a9e2b6
+Create Date: 2026-10-18 11:47:05.126904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6d2c91b4'
+down_revision: Union[str, Sequence[str], None] = '7d41c0a9e2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Must stay identical to app.models.course.search_document() for the planner to use it
+    op.execute(
+        """
+        CREATE INDEX ix_courses_search_document ON courses USING gin ((
+            setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(code, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(category, '')), 'B') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')
+        ))
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_courses_search_document', table_name='courses')
@@ -0,0 +1,72 @@
+"""add composite indexes for enrollments, waitlist_entries and reviews
+
+Revision ID: 5c9c2207e9fe
+Revises: e12bf3a1b8e3
+Create Date: 2026-10-18 11:47:05.261840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c9c2207e9fe'
+down_revision: Union[str, Sequence[str], None] = 'e12bf3a1b8e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DUPLICATE_ENROLLMENTS = """
+    SELECT user_id, course_id, COUNT(*) FROM enrollments
+    GROUP BY user_id, course_id HAVING COUNT(*) > 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Check-then-insert let concurrent requests create duplicates, which the unique
+    # indexes below would reject. Duplicate enrollments can carry different grades and
+    # reviews, so they are left for an operator to resolve rather than guessed at.
+    duplicates = op.get_bind().execute(sa.text(DUPLICATE_ENROLLMENTS)).fetchall()
+    if duplicates:
+        raise RuntimeError(
+            f"{len(duplicates)} (user_id, course_id) pair(s) have more than one enrollment. "
+            f"Keep one row per pair (list them with: {' '.join(DUPLICATE_ENROLLMENTS.split())}), "
+            "then run the migration again."
+        )
+
+    # Duplicate waitlist entries carry nothing but their position: keep the earliest
+    op.execute(
+        """
+        DELETE FROM waitlist_entries AS later
+        USING waitlist_entries AS earlier
+        WHERE later.user_id = earlier.user_id
+          AND later.course_id = earlier.course_id
+          AND (earlier.created_at, earlier.id) < (later.created_at, later.id)
+        """
+    )
+    op.execute(
+        """
+        UPDATE courses SET
+            waitlist_count = (SELECT COUNT(*) FROM waitlist_entries WHERE waitlist_entries.course_id = courses.id)
+        """
+    )
+
+    op.create_index('ix_enrollments_user_id_course_id', 'enrollments', ['user_id', 'course_id'], unique=True)
+    op.create_index('ix_enrollments_course_id_created_at', 'enrollments', ['course_id', 'created_at'], unique=False)
+    op.create_index('ix_waitlist_entries_user_id_course_id', 'waitlist_entries', ['user_id', 'course_id'], unique=True)
+    op.create_index('ix_waitlist_entries_course_id_created_at', 'waitlist_entries', ['course_id', 'created_at'], unique=False)
+    op.create_index('ix_reviews_course_id_created_at', 'reviews', ['course_id', 'created_at'], unique=False)
+    op.create_index('ix_reviews_user_id', 'reviews', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_user_id', table_name='reviews')
+    op.drop_index('ix_reviews_course_id_created_at', table_name='reviews')
+    op.drop_index('ix_waitlist_entries_course_id_created_at', table_name='waitlist_entries')
+    op.drop_index('ix_waitlist_entries_user_id_course_id', table_name='waitlist_entries')
+    op.drop_index('ix_enrollments_course_id_created_at', table_name='enrollments')
+    op.drop_index('ix_enrollments_user_id_course_id', table_name='enrollments')
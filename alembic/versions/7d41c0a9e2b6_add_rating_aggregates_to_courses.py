@@ -0,0 +1,44 @@
+"""add rating_sum, rating_count and average_rating aggregates to courses
+
+Revision ID: 7d41c0a9e2b6
+Revises: 5c9c2207e9fe
+Create Date: 2026-10-18 11:02:17.318450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d41c0a9e2b6'
+down_revision: Union[str, Sequence[str], None] = '5c9c2207e9fe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('courses', sa.Column('rating_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('courses', sa.Column('average_rating', sa.Float(), nullable=True))
+    op.create_index(op.f('ix_courses_average_rating'), 'courses', ['average_rating'], unique=False)
+
+    # Backfill from the existing reviews
+    op.execute(
+        """
+        UPDATE courses SET
+            rating_sum = COALESCE((SELECT SUM(rating) FROM reviews WHERE reviews.course_id = courses.id), 0),
+            rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.course_id = courses.id),
+            average_rating = (SELECT AVG(rating) FROM reviews WHERE reviews.course_id = courses.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_courses_average_rating'), table_name='courses')
+    op.drop_column('courses', 'average_rating')
+    op.drop_column('courses', 'rating_count')
+    op.drop_column('courses', 'rating_sum')
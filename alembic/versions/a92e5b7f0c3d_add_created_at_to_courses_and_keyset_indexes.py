@@ -0,0 +1,33 @@
+"""add created_at to courses and keyset pagination indexes
+
+Revision ID: a92e5b7f0c3d
+Revises: 3f8a6d2c91b4
+Create Date: 2026-10-18 12:31:48.774210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a92e5b7f0c3d'
+down_revision: Union[str, Sequence[str], None] = '3f8a6d2c91b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing courses all get the migration time; id still orders them deterministically
+    op.add_column('courses', sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.create_index('ix_courses_created_at_id', 'courses', ['created_at', 'id'], unique=False)
+    op.create_index('ix_enrollments_created_at_id', 'enrollments', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_enrollments_created_at_id', table_name='enrollments')
+    op.drop_index('ix_courses_created_at_id', table_name='courses')
+    op.drop_column('courses', 'created_at')
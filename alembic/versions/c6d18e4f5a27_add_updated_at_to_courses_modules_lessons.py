@@ -0,0 +1,34 @@
+"""add updated_at to courses, modules and lessons
+
+Revision ID: c6d18e4f5a27
+Revises: a92e5b7f0c3d
+Create Date: 2026-10-18 14:05:33.902118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d18e4f5a27'
+down_revision: Union[str, Sequence[str], None] = 'a92e5b7f0c3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.create_index(op.f('ix_courses_updated_at'), 'courses', ['updated_at'], unique=False)
+    op.add_column('modules', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+    op.add_column('lessons', sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('lessons', 'updated_at')
+    op.drop_column('modules', 'updated_at')
+    op.drop_index(op.f('ix_courses_updated_at'), table_name='courses')
+    op.drop_column('courses', 'updated_at')
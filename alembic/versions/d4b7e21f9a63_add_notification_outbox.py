@@ -0,0 +1,46 @@
+"""add notification outbox
+
+Revision ID: d4b7e21f9a63
+Revises: c6d18e4f5a27
+Create Date: 2026-10-18 17:12:08.415230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4b7e21f9a63'
+down_revision: Union[str, Sequence[str], None] = 'c6d18e4f5a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('notifications',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('kind', sa.Enum('ENROLLMENT', 'WAITLIST_JOINED', 'WAITLIST_PROMOTION', 'WELCOME', 'LOGIN', name='notificationkind'), nullable=False),
+    sa.Column('recipient', sa.String(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'SENT', 'DEAD', name='notificationstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notifications_id'), 'notifications', ['id'], unique=False)
+    op.create_index('ix_notifications_status_available_at', 'notifications', ['status', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_notifications_status_available_at', table_name='notifications')
+    op.drop_index(op.f('ix_notifications_id'), table_name='notifications')
+    op.drop_table('notifications')
+    sa.Enum(name='notificationstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='notificationkind').drop(op.get_bind(), checkfirst=True)
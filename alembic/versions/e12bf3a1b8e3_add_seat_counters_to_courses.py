@@ -0,0 +1,39 @@
+"""add enrolled_count and waitlist_count counters to courses
+
+Revision ID: e12bf3a1b8e3
+Revises: cbe345d2eb3b
+Create Date: 2026-10-18 09:12:41.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e12bf3a1b8e3'
+down_revision: Union[str, Sequence[str], None] = 'cbe345d2eb3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('courses', sa.Column('enrolled_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('courses', sa.Column('waitlist_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing rows
+    op.execute(
+        """
+        UPDATE courses SET
+            enrolled_count = (SELECT COUNT(*) FROM enrollments WHERE enrollments.course_id = courses.id),
+            waitlist_count = (SELECT COUNT(*) FROM waitlist_entries WHERE waitlist_entries.course_id = courses.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('courses', 'waitlist_count')
+    op.drop_column('courses', 'enrolled_count')
@@ -0,0 +1,51 @@
+"""add content-addressed uploads
+
+Revision ID: e8a3c5d70b14
+Revises: d4b7e21f9a63
+Create Date: 2026-10-18 18:03:41.226874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a3c5d70b14'
+down_revision: Union[str, Sequence[str], None] = 'd4b7e21f9a63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stored_files',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_table('uploads',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('filename', sa.String(), nullable=True),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('uploaded_by', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['sha256'], ['stored_files.sha256'], ),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_uploads_id'), 'uploads', ['id'], unique=False)
+    op.create_index('ix_uploads_sha256', 'uploads', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_uploads_sha256', table_name='uploads')
+    op.drop_index(op.f('ix_uploads_id'), table_name='uploads')
+    op.drop_table('uploads')
+    op.drop_table('stored_files')
@@ -0,0 +1,45 @@
+"""add upload sessions
+
+Revision ID: f5c2d9a4e317
+Revises: e8a3c5d70b14
+Create Date: 2026-10-18 19:12:05.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2d9a4e317'
+down_revision: Union[str, Sequence[str], None] = 'e8a3c5d70b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upload_sessions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('owner_id', sa.UUID(), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('chunk_size', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('OPEN', 'COMPLETING', name='uploadsessionstatus'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_sessions_id'), 'upload_sessions', ['id'], unique=False)
+    op.create_index('ix_upload_sessions_updated_at', 'upload_sessions', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_upload_sessions_updated_at', table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_id'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
+    sa.Enum(name='uploadsessionstatus').drop(op.get_bind(), checkfirst=True)
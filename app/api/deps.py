@@ -1,10 +1,12 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.core.security import decode_access_token
+from app.core.principal import Principal, principal_cache
+from app.core.pagination import Cursor, decode_cursor
 from app.crud.user import user_crud
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from typing import Optional
 import uuid
 
@@ -13,10 +15,10 @@ import uuid
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
-):
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -35,17 +37,24 @@ def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    # Get user from database
-    user = user_crud.get_by_id(db, user_id=uuid.UUID(user_id))
+    # Serve the principal from the per-process cache, falling back to the database
+    user_uuid = uuid.UUID(user_id)
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+    
+    user = await user_crud.get_by_id_async(db, user_id=user_uuid)
     
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.set(user_uuid, principal)
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_user)
 ):
     if not current_user.is_active:
         raise HTTPException(
@@ -56,7 +65,7 @@ def get_current_active_user(
 
 
 def require_role(required_role: UserRole):
-    def role_checker(current_user: User = Depends(get_current_active_user)):
+    async def role_checker(current_user: Principal = Depends(get_current_active_user)):
         if current_user.role != required_role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -67,7 +76,7 @@ def require_role(required_role: UserRole):
 
 
 # Convenience dependencies for common role checks
-def get_current_admin(current_user: User = Depends(get_current_active_user)):
+async def get_current_admin(current_user: Principal = Depends(get_current_active_user)):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -76,7 +85,7 @@ def get_current_admin(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
-def get_current_student(current_user: User = Depends(get_current_active_user)):
+async def get_current_student(current_user: Principal = Depends(get_current_active_user)):
     if current_user.role != UserRole.STUDENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -85,10 +94,24 @@ def get_current_student(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
-def get_current_instructor(current_user: User = Depends(get_current_active_user)):
+async def get_current_instructor(current_user: Principal = Depends(get_current_active_user)):
     if current_user.role not in [UserRole.INSTRUCTOR, UserRole.ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Instructor or Admin access required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_cursor(
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header; takes precedence over skip")
+) -> Optional[Cursor]:
+    if after is None:
+        return None
+    try:
+        return decode_cursor(after)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
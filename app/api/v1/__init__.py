@@ -7,6 +7,7 @@ from app.api.v1.waitlist import router as waitlist_router
 from app.api.v1.review import router as review_router
 from app.api.v1.content import router as content_router
 from app.api.v1.analytics import router as analytics_router
+from app.api.v1.system import router as system_router
 
 api_router = APIRouter()
 
@@ -25,4 +26,6 @@ api_router.include_router(review_router, prefix="/reviews", tags=["Reviews"])
 
 api_router.include_router(content_router, prefix="/content", tags=["Course Content"])
 
-api_router.include_router(analytics_router, prefix="/analytics", tags=["Analytics"])
\ No newline at end of file
+api_router.include_router(analytics_router, prefix="/analytics", tags=["Analytics"])
+
+api_router.include_router(system_router, prefix="/system", tags=["System"])
\ No newline at end of file
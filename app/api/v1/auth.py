@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
@@ -9,7 +9,8 @@ from app.crud.user import user_crud
 from app.core.security import create_access_token
 from app.config import settings
 from app.core.limiter import limiter
-from app.core.notifier import send_welcome_email, send_login_notification
+from app.crud.notification import notification_crud
+from app.models.notification import NotificationKind
 
 
 router = APIRouter()
@@ -18,7 +19,6 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def register(
     user: UserCreate, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     
@@ -32,19 +32,17 @@ def register(
     
     # Create the user
     db_user = user_crud.create(db, user=user)
+    notification_crud.enqueue(db, NotificationKind.WELCOME, recipient=user.email, user_name=user.name)
     db.commit()
     db.refresh(db_user)
     
-    background_tasks.add_task(send_welcome_email, user_email=db_user.email, user_name=db_user.name)
-    
     return db_user
 
 
 @router.post("/login", response_model=Token)
-@limiter.limit("5/minute")
+@limiter.limit(settings.RATE_LIMIT_LOGIN)
 def login(
     request: Request,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
@@ -63,6 +61,10 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Commits the alert together with a rehashed password, if authenticate upgraded it
+    notification_crud.enqueue(db, NotificationKind.LOGIN, recipient=user.email, ip_address=request.client.host)
+    db.commit()
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
@@ -70,8 +72,6 @@ def login(
         expires_delta=access_token_expires
     )
     
-    background_tasks.add_task(send_login_notification, user_email=user.email, ip_address=request.client.host)
-    
     return {
         "access_token": access_token, 
         "token_type": "bearer",
@@ -1,19 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-import shutil
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Request, Response
+import asyncio
 import os
+import re
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Set
+from datetime import timedelta
 import uuid
+from pydantic import TypeAdapter
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.api import deps
 from app.crud.module import module_crud
 from app.crud.lesson import lesson_crud
 from app.crud.course import course_crud
 from app.crud.enrollment import enrollment_crud
-from app.schema.module import ModuleCreate, ModuleUpdate, ModuleResponse, ModuleWithLessons
+from app.crud.upload import upload_crud
+from app.schema.module import ModuleCreate, ModuleUpdate, ModuleResponse, ModuleWithLessons, ModuleOutline
 from app.schema.lesson import LessonCreate, LessonUpdate, LessonResponse
+from app.schema.upload import UploadResponse, UploadSessionCreate, UploadSessionResponse
 from app.models.user import User, UserRole
+from app.models.upload import UploadSession, UploadSessionStatus
+from app.core.outline_cache import CachedOutline, outline_cache
+from app.core.singleflight import outline_flights
+from app.core.storage import (
+    ChunkSizeMismatch, StagedFile, UploadTooLarge, assemble_chunks, content_path, discard, index_ranges,
+    public_url, publish, received_chunks, remove_retired, remove_session_files, restore_stored, retire_stored,
+    stage_upload, write_chunk
+)
+from app.config import settings
+from app.core.http_cache import PRIVATE_REVALIDATE, weak_etag, etag_matches, not_modified, set_validators
 
 router = APIRouter()
 
@@ -36,23 +52,15 @@ def create_module(
     
     db_module = module_crud.create(db, module=module)
     db.commit()
+    outline_cache.bump(course.id)
     db.refresh(db_module)
     return db_module
 
 
-@router.get("/courses/{course_id}/modules", response_model=List[ModuleWithLessons])
-def get_course_modules(
-    course_id: uuid.UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user)
-):
-    """Get all modules for a course with their lessons.
-    Instructors and admins can view any course.
-    Students must be enrolled in the course.
-    """
-    # Enrollment gate: students must be enrolled
+async def _require_content_access(db: AsyncSession, current_user: User, course_id: uuid.UUID):
+    """Instructors and admins can view any course; students must be enrolled in it."""
     if current_user.role == UserRole.STUDENT:
-        enrollment = enrollment_crud.get_by_user_and_course(
+        enrollment = await enrollment_crud.get_by_user_and_course_async(
             db, user_id=current_user.id, course_id=course_id
         )
         if not enrollment:
@@ -60,7 +68,70 @@ def get_course_modules(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You must be enrolled in this course to view its content"
             )
-    return module_crud.get_by_course(db, course_id=course_id)
+
+
+@outline_flights.coalesce(key=lambda db, course_id, version, include_content: (course_id, version, include_content))
+async def _load_outline(db: AsyncSession, course_id: uuid.UUID, version: Optional[int], include_content: bool) -> CachedOutline:
+    """
+    Encode the outline and store it in the outline cache (unless the version is unknown);
+    concurrent misses share one load.
+    """
+    variant, schema = ("full", ModuleWithLessons) if include_content else ("outline", ModuleOutline)
+    modules = await module_crud.get_outline_async(db, course_id=course_id, include_content=include_content)
+    adapter = TypeAdapter(List[schema])
+    body = adapter.dump_json(adapter.validate_python(modules, from_attributes=True))
+    if version is None:
+        return CachedOutline.from_body(body)
+    return await outline_cache.set(course_id, version, variant, body)
+
+
+async def _cached_outline(request: Request, db: AsyncSession, course_id: uuid.UUID, include_content: bool) -> Response:
+    """
+    Serve the outline as pre-encoded JSON, from the outline cache when it is current.
+    A client already holding it gets a 304 without any serialization.
+    """
+    version = await outline_cache.current_version(course_id)
+    entry = None
+    if version is not None:
+        entry = await outline_cache.get(course_id, version, "full" if include_content else "outline")
+    if entry is None:
+        entry = await _load_outline(db, course_id=course_id, version=version, include_content=include_content)
+    
+    if etag_matches(request, entry.etag):
+        return not_modified(entry.etag, PRIVATE_REVALIDATE)
+    response = Response(content=entry.body, media_type="application/json")
+    set_validators(response, entry.etag, PRIVATE_REVALIDATE)
+    return response
+
+
+@router.get("/courses/{course_id}/modules", response_model=List[ModuleWithLessons])
+async def get_course_modules(
+    course_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Get all modules for a course with their lessons, including lesson content.
+    Instructors and admins can view any course.
+    Students must be enrolled in the course.
+    """
+    await _require_content_access(db, current_user, course_id)
+    return await _cached_outline(request, db, course_id, include_content=True)
+
+
+@router.get("/courses/{course_id}/outline", response_model=List[ModuleOutline])
+async def get_course_outline(
+    course_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_active_user)
+):
+    """Get the modules and lessons of a course without lesson content bodies.
+    Fetch a lesson's content with GET /lessons/{lesson_id}.
+    Same access rules as /modules.
+    """
+    await _require_content_access(db, current_user, course_id)
+    return await _cached_outline(request, db, course_id, include_content=False)
 
 
 @router.patch("/modules/{module_id}", response_model=ModuleResponse)
@@ -82,6 +153,7 @@ def update_module(
     
     updated_module = module_crud.update(db, module_id=module_id, module_update=module_update)
     db.commit()
+    outline_cache.bump(course.id)
     db.refresh(updated_module)
     return updated_module
 
@@ -103,6 +175,7 @@ def delete_module(
     
     module_crud.delete(db, module_id=module_id)
     db.commit()
+    outline_cache.bump(course.id)
     return None
 
 
@@ -125,6 +198,7 @@ def create_lesson(
     
     db_lesson = lesson_crud.create(db, lesson=lesson)
     db.commit()
+    outline_cache.bump(course.id)
     db.refresh(db_lesson)
     return db_lesson
 
@@ -132,13 +206,32 @@ def create_lesson(
 @router.get("/lessons/{lesson_id}", response_model=LessonResponse)
 def get_lesson(
     lesson_id: uuid.UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user)
 ):
-    """Get a specific lesson."""
+    """Get a specific lesson. Students must be enrolled in its course."""
     db_lesson = lesson_crud.get_by_id(db, lesson_id=lesson_id)
     if not db_lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
+    
+    # Same rule as _require_content_access: the outline links here for every lesson body
+    if current_user.role == UserRole.STUDENT:
+        db_module = module_crud.get_by_id(db, module_id=db_lesson.module_id)
+        enrollment = enrollment_crud.get_by_user_and_course(
+            db, user_id=current_user.id, course_id=db_module.course_id
+        )
+        if not enrollment:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You must be enrolled in this course to view its content"
+            )
+    
+    etag = weak_etag("lesson", db_lesson.id, db_lesson.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    set_validators(response, etag, PRIVATE_REVALIDATE)
     return db_lesson
 
 
@@ -161,6 +254,7 @@ def update_lesson(
     
     updated_lesson = lesson_crud.update(db, lesson_id=lesson_id, lesson_update=lesson_update)
     db.commit()
+    outline_cache.bump(course.id)
     db.refresh(updated_lesson)
     return updated_lesson
 
@@ -183,31 +277,265 @@ def delete_lesson(
     
     lesson_crud.delete(db, lesson_id=lesson_id)
     db.commit()
+    outline_cache.bump(course.id)
     return None
 
 
-# --- File Upload Endpoint ---
+# --- File Upload Endpoints ---
+
+# Kept on stored files so they are served with a sensible content type
+_SAFE_EXTENSION = re.compile(r"^\.[A-Za-z0-9]{1,10}$")
+
+
+async def _store_upload(
+    db: AsyncSession,
+    staged: StagedFile,
+    filename: Optional[str],
+    content_type: Optional[str],
+    current_user: User,
+    session_id: Optional[uuid.UUID] = None
+) -> UploadResponse:
+    """Record a staged file as an upload and move it to its content address (consumes staged)."""
+    extension = os.path.splitext(filename or "")[1]
+    if not _SAFE_EXTENSION.match(extension):
+        extension = ""
+    try:
+        db_upload, path = await upload_crud.create_async(
+            db,
+            sha256=staged.sha256,
+            size=staged.size,
+            path=content_path(staged.sha256, extension),
+            filename=filename,
+            content_type=content_type,
+            uploaded_by=current_user.id
+        )
+        if session_id is not None:
+            await upload_crud.delete_session_async(db, session_id)
+        # Moved into place before the commit: a file without a row is only garbage for
+        # gc-uploads, a row without its file would be a broken upload. For known content
+        # this just rewrites identical bytes
+        await publish(staged, path)
+        await db.commit()
+    except BaseException:
+        await discard(staged.temp_path)
+        raise
+    
+    return UploadResponse(id=db_upload.id, url=public_url(path), sha256=staged.sha256, size=staged.size)
+
 
-@router.post("/upload", status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_file(
     file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(deps.get_current_instructor)
 ):
     """
     Upload a file (syllabus or lesson resource).
     Returns the URL to access the file.
-    Instructor only.
+    Instructor only. Identical content is stored once, however often it is uploaded.
+    For large files use a resumable upload session instead.
     """
-    upload_dir = "uploads"
-    os.makedirs(upload_dir, exist_ok=True)
+    try:
+        staged = await stage_upload(file)
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File exceeds the upload limit of {settings.UPLOAD_MAX_BYTES} bytes"
+        )
+    return await _store_upload(db, staged, file.filename, file.content_type, current_user)
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_upload(
+    upload_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """Delete an upload. Its content is removed with the last upload that references it.
+    Uploader or admin only.
+    """
+    db_upload = upload_crud.get_by_id(db, upload_id=upload_id)
+    if not db_upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
     
-    # Create a unique filename to avoid collisions
-    file_extension = os.path.splitext(file.filename)[1]
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
-    file_path = os.path.join(upload_dir, unique_filename)
+    if current_user.role != UserRole.ADMIN and db_upload.uploaded_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the uploader or an admin can delete this upload")
     
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    unreferenced_path = upload_crud.delete(db, upload_id=upload_id)
+    # Moved aside while the stored_files row is still locked: a concurrent upload of the
+    # same content waits on that lock, so it publishes its copy only after this
+    retired_path = retire_stored(unreferenced_path) if unreferenced_path else None
+    try:
+        db.commit()
+    except BaseException:
+        if retired_path:
+            restore_stored(retired_path, unreferenced_path)
+        raise
+    if retired_path:
+        remove_retired(retired_path)
+    return None
+
+
+# --- Resumable Upload Sessions ---
+
+def _session_response(db_session: UploadSession, received: Set[int]) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=db_session.id,
+        filename=db_session.filename,
+        size=db_session.size,
+        chunk_size=db_session.chunk_size,
+        chunk_count=db_session.chunk_count,
+        received=index_ranges(received),
+        expires_at=db_session.updated_at + timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS)
+    )
+
+
+async def _get_own_session(db: AsyncSession, session_id: uuid.UUID, current_user: User) -> UploadSession:
+    db_session = await upload_crud.get_session_async(db, session_id=session_id)
+    if not db_session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if db_session.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the instructor who started this upload can use it")
+    return db_session
+
+
+@router.post("/uploads/sessions", response_model=UploadSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_session(
+    session_in: UploadSessionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """
+    Start a resumable upload. PUT the file's chunks (any order, retries allowed) to
+    /uploads/sessions/{id}/chunks/{index}, check progress with GET /uploads/sessions/{id},
+    then POST /uploads/sessions/{id}/complete. Instructor only.
+    """
+    if session_in.size > settings.UPLOAD_SESSION_MAX_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"File exceeds the upload limit of {settings.UPLOAD_SESSION_MAX_BYTES} bytes"
+        )
+    chunk_size = session_in.chunk_size or settings.UPLOAD_SESSION_CHUNK_SIZE
+    if chunk_size > settings.UPLOAD_SESSION_MAX_CHUNK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"chunk_size may not exceed {settings.UPLOAD_SESSION_MAX_CHUNK_SIZE} bytes"
+        )
     
-    # Return the relative URL
-    return {"url": f"/uploads/{unique_filename}"}
+    db_session = await upload_crud.create_session_async(
+        db,
+        owner_id=current_user.id,
+        filename=session_in.filename,
+        content_type=session_in.content_type,
+        size=session_in.size,
+        chunk_size=chunk_size
+    )
+    await db.commit()
+    return _session_response(db_session, set())
+
+
+@router.get("/uploads/sessions/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """Progress of a resumable upload: which chunks have been received."""
+    db_session = await _get_own_session(db, session_id, current_user)
+    return _session_response(db_session, await received_chunks(session_id))
+
+
+@router.put("/uploads/sessions/{session_id}/chunks/{index}", status_code=status.HTTP_204_NO_CONTENT)
+async def put_upload_chunk(
+    session_id: uuid.UUID,
+    index: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """
+    Upload one chunk as the raw request body. Every chunk is chunk_size bytes except
+    the last. Re-sending a chunk replaces it.
+    """
+    db_session = await _get_own_session(db, session_id, current_user)
+    if not 0 <= index < db_session.chunk_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk index must be between 0 and {db_session.chunk_count - 1}"
+        )
+    expected = db_session.chunk_length(index)
+    size_error = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Chunk {index} must be exactly {expected} bytes"
+    )
+    declared = request.headers.get("content-length")
+    if declared is not None and declared != str(expected):
+        raise size_error
+    
+    if not await upload_crud.touch_session_async(db, session_id=session_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already being completed")
+    # Committed before the body is read: no connection is held while the chunk streams in
+    await db.commit()
+    
+    try:
+        await write_chunk(session_id, index, request.stream(), expected)
+    except ChunkSizeMismatch:
+        raise size_error
+    return None
+
+
+@router.post("/uploads/sessions/{session_id}/complete", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload_session(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """Assemble the received chunks into an upload, exactly like POST /upload would store it."""
+    db_session = await _get_own_session(db, session_id, current_user)
+    received = await received_chunks(session_id)
+    missing = [index for index in range(db_session.chunk_count) if index not in received]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{len(missing)} chunk(s) missing, starting with chunk {missing[0]}"
+        )
+    filename, content_type, chunk_count = db_session.filename, db_session.content_type, db_session.chunk_count
+    
+    if not await upload_crud.set_session_status_async(
+        db, session_id=session_id, expected=UploadSessionStatus.OPEN, status=UploadSessionStatus.COMPLETING
+    ):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already being completed")
+    await db.commit()
+    
+    try:
+        staged = await assemble_chunks(session_id, chunk_count)
+        response = await _store_upload(db, staged, filename, content_type, current_user, session_id=session_id)
+    except Exception:
+        # Leave the session resumable: the chunks are still there
+        await db.rollback()
+        await upload_crud.set_session_status_async(
+            db, session_id=session_id, expected=UploadSessionStatus.COMPLETING, status=UploadSessionStatus.OPEN
+        )
+        await db.commit()
+        raise
+    
+    await asyncio.to_thread(remove_session_files, session_id)
+    return response
+
+
+@router.delete("/uploads/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session(
+    session_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(deps.get_current_instructor)
+):
+    """Abandon a resumable upload and discard its chunks."""
+    await _get_own_session(db, session_id, current_user)
+    if not await upload_crud.set_session_status_async(
+        db, session_id=session_id, expected=UploadSessionStatus.OPEN, status=UploadSessionStatus.COMPLETING
+    ):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload session is already being completed")
+    await upload_crud.delete_session_async(db, session_id=session_id)
+    await db.commit()
+    await asyncio.to_thread(remove_session_files, session_id)
+    return None
@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from pydantic import TypeAdapter
+from app.database import get_db, get_async_db
 from app.schema.course import CourseCreate, CourseUpdate, CourseResponse, CourseWithDetails
 from app.crud.course import course_crud
-from app.crud.enrollment import enrollment_crud
-from app.crud.waitlist import waitlist_crud
-from app.api.deps import get_current_admin, get_current_instructor, get_current_user
+from app.api.deps import get_current_admin, get_current_instructor, get_current_user, get_cursor
+from app.core.pagination import NEXT_CURSOR_HEADER, Cursor, next_cursor
+from app.core.catalog_cache import CatalogPage, catalog_cache
+from app.core.singleflight import course_flights
+from app.core.limiter import limit_when
+from app.config import settings
+from app.core.http_cache import PUBLIC_REVALIDATE, weak_etag, etag_matches, not_modified, set_validators
 from app.models.user import User
 import uuid
 
 
 router = APIRouter()
 
-def enrich_course(db: Session, course):
-    if not course:
-        return None
-    course.enrollment_count = enrollment_crud.count_enrollments_for_course(db, course.id)
-    course.waitlist_count = waitlist_crud.count_by_course(db, course.id)
-    return course
+_course_list = TypeAdapter(List[CourseResponse])
+
+# Plain catalog pages are served from cache; only full-text searches count against the limit
+search_rate_limit = limit_when(
+    settings.RATE_LIMIT_SEARCH,
+    scope="course-search",
+    applies=lambda request: bool(request.query_params.get("search"))
+)
 
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 def create_course(
@@ -47,29 +55,58 @@ def create_course(
     db_course = course_crud.create(db, course=course)
     db.commit()
     db.refresh(db_course)
-    return enrich_course(db, db_course)
+    return db_course
 
 
 @router.get("/", response_model=List[CourseResponse])
-def get_all_courses(
+async def get_all_courses(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
-    search: Optional[str] = Query(None, description="Search by title or code"),
+    search: Optional[str] = Query(None, description="Full-text search over title, code, category and description; results are ordered by relevance"),
     category: Optional[str] = Query(None, description="Filter by category"),
     difficulty: Optional[str] = Query(None, description="Filter by difficulty (Beginner, Intermediate, Advanced)"),
     min_rating: Optional[float] = Query(None, description="Filter by minimum average rating"),
-    db: Session = Depends(get_db)
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_db),
+    _: None = Depends(search_rate_limit)
 ):
-    courses = course_crud.get_all_active(
-        db, 
-        skip=skip, 
-        limit=limit, 
-        search=search, 
-        category=category,
-        difficulty=difficulty,
-        min_rating=min_rating
-    )
-    return [enrich_course(db, c) for c in courses]
+    if search and after:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search results are ranked by relevance; page them with skip instead of a cursor"
+        )
+    
+    async def load_page() -> CatalogPage:
+        # Every catalog page is a function of the courses table and the URL, so one cheap
+        # aggregate decides whether the client's copy is still current
+        etag = weak_etag("catalog", *await course_crud.get_catalog_version_async(db))
+        courses = await course_crud.get_all_active_async(
+            db, 
+            skip=skip, 
+            limit=limit, 
+            search=search, 
+            category=category,
+            difficulty=difficulty,
+            min_rating=min_rating,
+            after=after
+        )
+        return CatalogPage(
+            etag=etag,
+            body=_course_list.dump_json(_course_list.validate_python(courses, from_attributes=True)),
+            next_cursor=None if search else next_cursor(courses, limit),
+        )
+    
+    key = catalog_cache.key(skip, limit, request.query_params.get("after"), search, category, difficulty, min_rating)
+    page = await catalog_cache.get_or_load(key, load_page)
+    
+    if etag_matches(request, page.etag):
+        return not_modified(page.etag, PUBLIC_REVALIDATE)
+    response = Response(content=page.body, media_type="application/json")
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    set_validators(response, page.etag, PUBLIC_REVALIDATE)
+    return response
 
 
 # INSTRUCTOR ENDPOINTS — must be ABOVE /{course_id} to avoid route collision
@@ -79,18 +116,42 @@ def get_instructor_courses(
     current_user: User = Depends(get_current_instructor)
 ):
     courses = course_crud.get_by_instructor(db, instructor_id=current_user.id)
-    return [enrich_course(db, c) for c in courses]
+    return courses
+
+
+@course_flights.coalesce(key=lambda db, course_id: course_id)
+async def _course_etag(db: AsyncSession, course_id: uuid.UUID) -> Tuple[str, int]:
+    """ETag of a course page and the number of rows it covers (0: no such course)."""
+    last_updated, rows = await course_crud.get_detail_version_async(db, course_id=course_id)
+    return weak_etag("course", course_id, last_updated, rows), rows
+
+
+@course_flights.coalesce(key=lambda db, course_id, etag: (course_id, etag))
+async def _load_course(db: AsyncSession, course_id: uuid.UUID, etag: str) -> Optional[CourseWithDetails]:
+    # Keyed by ETag as well: a request that saw a newer version never joins an older load
+    course = await course_crud.get_by_id_async(db, course_id=course_id)
+    return CourseWithDetails.model_validate(course) if course else None
 
 
 @router.get("/{course_id}", response_model=CourseWithDetails)
-def get_course(course_id: uuid.UUID, db: Session = Depends(get_db)):
-    course = course_crud.get_by_id(db, course_id=course_id)
+async def get_course(
+    course_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    etag, rows = await _course_etag(db, course_id=course_id)
+    if rows and etag_matches(request, etag):
+        return not_modified(etag, PUBLIC_REVALIDATE)
+    
+    course = await _load_course(db, course_id=course_id, etag=etag)
     if not course:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Course not found"
         )
-    return enrich_course(db, course)
+    set_validators(response, etag, PUBLIC_REVALIDATE)
+    return course
 
 
 @router.put("/{course_id}", response_model=CourseResponse)
@@ -123,7 +184,7 @@ def update_course(
     updated_course = course_crud.update(db, course_id=course_id, course_update=course_update)
     db.commit()
     db.refresh(updated_course)
-    return enrich_course(db, updated_course)
+    return updated_course
 
 
 @router.delete("/{course_id}", response_model=CourseResponse)
@@ -143,5 +204,5 @@ def delete_course(
     
     db.commit()
     db.refresh(course)
-    return enrich_course(db, course)
+    return course
 
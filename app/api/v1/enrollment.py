@@ -1,34 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Literal
+from app.database import get_db, get_async_db
 from app.schema.enrollment import EnrollmentCreate, EnrollmentResponse, EnrollmentWithDetails, EnrollmentUpdate
 from app.crud.enrollment import enrollment_crud
 from app.crud.course import course_crud
 from app.crud.waitlist import waitlist_crud
-from app.api.deps import get_current_student, get_current_admin, get_current_instructor
+from app.api.deps import get_current_student, get_current_admin, get_current_instructor, get_cursor
+from app.core.pagination import Cursor, set_next_cursor
 from app.models.user import User, UserRole
 from app.models.course import Course
 from app.models.enrollment import Enrollment, EnrollmentStatus
-from app.core.notifier import send_enrollment_notification, send_waitlist_promotion_notification
+from app.crud.notification import notification_crud
+from app.models.notification import NotificationKind
+from app.config import settings
+from app.core.limiter import limiter, get_user_or_ip
 import uuid
 import logging
+import csv
+import io
+import json
 
 logger = logging.getLogger("app")
 router = APIRouter()
 
 
 @router.post("/", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
+@limiter.limit(settings.RATE_LIMIT_ENROLLMENT, key_func=get_user_or_ip)
 def enroll_in_course(
+    request: Request,
     enrollment: EnrollmentCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_student)
 ):
+    conditional = settings.ENROLLMENT_SEAT_STRATEGY == "conditional"
+    
     # Use a transaction for atomic enrollment
     try:
-        # Fetch course with lock to prevent capacity race conditions
-        course = db.query(Course).filter(Course.id == enrollment.course_id).with_for_update().first()
+        course_query = db.query(Course).filter(Course.id == enrollment.course_id)
+        if not conditional:
+            # Fetch course with lock to prevent capacity race conditions
+            course_query = course_query.with_for_update()
+        course = course_query.first()
         
         if not course:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
@@ -52,34 +68,53 @@ def enroll_in_course(
         if existing_enrollment:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already enrolled in this course")
         
-        # Check capacity
-        enrollment_count = enrollment_crud.count_enrollments_for_course(db, course_id=enrollment.course_id)
-        if enrollment_count >= course.capacity:
+        # Check capacity against the denormalized counter
+        # (authoritative on the locked row; a fast pre-check for the conditional strategy)
+        if course.enrolled_count >= course.capacity:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST, 
                 detail="Course is full. Please join the waitlist."
             )
         
         # Create enrollment
-        db_enrollment = enrollment_crud.create(db, course_id=enrollment.course_id, user_id=current_user.id)
+        db_enrollment = enrollment_crud.create(
+            db,
+            course_id=enrollment.course_id,
+            user_id=current_user.id,
+            seat_reserved=conditional
+        )
         
         # If student was on waitlist, remove them
         waitlist_crud.remove_user_from_course_waitlist(db, user_id=current_user.id, course_id=enrollment.course_id)
 
-        db.commit()
-        db.refresh(db_enrollment)
-        
-        # Background notification after successful commit
-        background_tasks.add_task(
-            send_enrollment_notification, 
-            user_email=current_user.email, 
+        if conditional:
+            # Claim the seat as the last statement so the course row lock is
+            # only held until the commit that follows
+            db.flush()
+            if not course_crud.reserve_seat(db, course_id=enrollment.course_id):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, 
+                    detail="Course is full. Please join the waitlist."
+                )
+
+        # Queued in the same transaction: sent if and only if the enrollment commits
+        notification_crud.enqueue(
+            db,
+            NotificationKind.ENROLLMENT,
+            recipient=current_user.email,
             course_title=course.title
         )
+        db.commit()
+        db.refresh(db_enrollment)
         
         return db_enrollment
     except HTTPException:
         db.rollback()
         raise
+    except IntegrityError:
+        # Unique (user_id, course_id) index caught a concurrent duplicate request
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already enrolled in this course")
     except Exception as e:
         db.rollback()
         logger.error(f"Error during enrollment: {str(e)}")
@@ -90,11 +125,11 @@ def enroll_in_course(
 
 
 @router.get("/me", response_model=List[EnrollmentWithDetails])
-def get_my_enrollments(
-    db: Session = Depends(get_db),
+async def get_my_enrollments(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_student)
 ):
-    return enrollment_crud.get_by_user(db, user_id=current_user.id)
+    return await enrollment_crud.get_by_user_async(db, user_id=current_user.id)
 
 
 @router.get("/me/transcript", response_model=List[EnrollmentWithDetails])
@@ -102,7 +137,7 @@ def get_my_transcript(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_student)
 ):
-    enrollments = enrollment_crud.get_by_user(db, user_id=current_user.id)
+    enrollments = enrollment_crud.get_by_user(db, user_id=current_user.id, with_details=True)
     return [e for e in enrollments if e.status == EnrollmentStatus.COMPLETED]
 
 
@@ -121,7 +156,6 @@ def get_my_waitlist(
 @router.delete("/{enrollment_id}", response_model=EnrollmentResponse)
 def deregister_from_course(
     enrollment_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_student)
 ):
@@ -152,10 +186,11 @@ def deregister_from_course(
             # Remove from waitlist
             waitlist_crud.delete(db, entry_id=next_entry.id)
             
-            # Send promotion notification in background
-            background_tasks.add_task(
-                send_waitlist_promotion_notification,
-                user_email=next_entry.user.email,
+            # Queue promotion notification with the promotion itself
+            notification_crud.enqueue(
+                db,
+                NotificationKind.WAITLIST_PROMOTION,
+                recipient=next_entry.user.email,
                 course_title=course.title
             )
             logger.info(f"Automatically promoted user {next_entry.user.email} to course {course.title}")
@@ -198,19 +233,86 @@ def grade_student(
 
 @router.get("/", response_model=List[EnrollmentWithDetails])
 def get_all_enrollments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin)
+):
+    enrollments = enrollment_crud.get_all(db, skip=skip, limit=limit, after=after, with_details=True)
+    set_next_cursor(response, enrollments, limit)
+    return enrollments
+
+
+EXPORT_FIELDS = [
+    "id", "created_at", "status", "grade",
+    "user_id", "user_email", "user_name",
+    "course_id", "course_code", "course_title",
+]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _export_record(row) -> dict:
+    record = dict(row._mapping)
+    record["status"] = record["status"].value
+    return record
+
+
+def _stream_export(rows, format: str, flush_every: int = 500):
+    """Serialize rows into text chunks, flushing every few hundred rows to keep writes efficient."""
+    buffer = io.StringIO()
+    writer = None
+    if format == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        # Send the header straight away so the download starts before the first batch is fetched
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    for count, row in enumerate(rows, start=1):
+        record = _export_record(row)
+        if writer:
+            writer.writerow(record)
+        else:
+            buffer.write(json.dumps(record, default=str) + "\n")
+        if count % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+def export_enrollments(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="ndjson (one JSON object per line) or csv"),
+    course_id: Optional[uuid.UUID] = Query(None, description="Only enrollments in this course"),
+    enrollment_status: Optional[EnrollmentStatus] = Query(None, alias="status", description="Only enrollments with this status"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin)
 ):
-    return enrollment_crud.get_all(db, skip=skip, limit=limit)
+    """
+    Stream every matching enrollment, with student and course details, in creation order.
+    Rows are fetched in batches through a server-side cursor, so memory stays flat for any export size.
+    """
+    rows = enrollment_crud.iter_export_rows(db, course_id=course_id, status=enrollment_status)
+    return StreamingResponse(
+        _stream_export(rows, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="enrollments.{format}"'}
+    )
 
 
 @router.get("/course/{course_id}/all", response_model=List[EnrollmentWithDetails])
 def get_course_enrollments(
     course_id: uuid.UUID,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[Cursor] = Depends(get_cursor),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_instructor)
 ):
@@ -223,13 +325,16 @@ def get_course_enrollments(
     if current_user.role != UserRole.ADMIN and course.instructor_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
     
-    return enrollment_crud.get_by_course(db, course_id=course_id, skip=skip, limit=limit)
+    enrollments = enrollment_crud.get_by_course(
+        db, course_id=course_id, skip=skip, limit=limit, after=after, with_details=True
+    )
+    set_next_cursor(response, enrollments, limit)
+    return enrollments
 
 
 @router.delete("/admin/{enrollment_id}", response_model=EnrollmentResponse)
 def admin_remove_enrollment(
     enrollment_id: uuid.UUID,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin)
 ):
@@ -254,9 +359,10 @@ def admin_remove_enrollment(
             db.add(new_enrollment)
             waitlist_crud.delete(db, entry_id=next_entry.id)
             
-            background_tasks.add_task(
-                send_waitlist_promotion_notification,
-                user_email=next_entry.user.email,
+            notification_crud.enqueue(
+                db,
+                NotificationKind.WAITLIST_PROMOTION,
+                recipient=next_entry.user.email,
                 course_title=course.title
             )
             logger.info(f"Admin: Automatically promoted user {next_entry.user.email} to course {course.title}")
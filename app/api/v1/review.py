@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.database import get_db, get_async_db
 from app.schema.review import ReviewCreate, ReviewResponse
 from app.crud.review import review_crud
 from app.crud.enrollment import enrollment_crud
-from app.api.deps import get_current_student
+from app.api.deps import get_current_student, get_cursor
+from app.core.pagination import Cursor, set_next_cursor
+from app.core.singleflight import review_flights
 from app.models.user import User
 from app.models.enrollment import EnrollmentStatus
 import uuid
@@ -55,11 +58,27 @@ def create_review(
     return db_review
 
 
+@review_flights.coalesce(key=lambda db, course_id, skip, limit, after: (course_id, skip, limit, after))
+async def _load_reviews(
+    db: AsyncSession,
+    course_id: uuid.UUID,
+    skip: int,
+    limit: int,
+    after: Optional[Cursor]
+) -> List[ReviewResponse]:
+    reviews = await review_crud.get_by_course_async(db, course_id=course_id, skip=skip, limit=limit, after=after)
+    return [ReviewResponse.model_validate(review) for review in reviews]
+
+
 @router.get("/{course_id}", response_model=List[ReviewResponse])
-def get_course_reviews(
+async def get_course_reviews(
     course_id: uuid.UUID,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    after: Optional[Cursor] = Depends(get_cursor),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    return review_crud.get_by_course(db, course_id=course_id, skip=skip, limit=limit)
+    reviews = await _load_reviews(db, course_id=course_id, skip=skip, limit=limit, after=after)
+    set_next_cursor(response, reviews, limit)
+    return reviews
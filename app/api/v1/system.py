@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core.principal import Principal, principal_cache
+from app.core.security import token_cache
+from app.core.password_pool import password_pool
+from app.core.outline_cache import outline_cache
+from app.core.catalog_cache import catalog_cache
+from app.core.singleflight import course_flights, outline_flights, review_flights
+from app.database import get_pool_stats
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def get_system_stats(current_user: Principal = Depends(deps.get_current_admin)):
+    """
+    Per-process runtime counters (admin only).
+    Each uvicorn worker keeps its own caches, so numbers are for the worker that answered.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_pool": password_pool.stats(),
+        "outline_cache": outline_cache.stats(),
+        "catalog_cache": catalog_cache.stats(),
+        # followers = requests that shared another request's in-flight load
+        "single_flight": {
+            "course": course_flights.stats(),
+            "outline": outline_flights.stats(),
+            "reviews": review_flights.stats(),
+        },
+        "db_pool": get_pool_stats(),
+    }
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.schema.user import UserResponse, UserProfileUpdate
-from app.models.user import User
+from app.core.principal import Principal
+from app.crud.user import user_crud
 from app.api.deps import get_current_active_user
 from app.database import get_db
 
@@ -10,7 +11,7 @@ router = APIRouter()
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+def get_current_user_profile(current_user: Principal = Depends(get_current_active_user)):
     return current_user
 
 
@@ -18,12 +19,17 @@ def get_current_user_profile(current_user: User = Depends(get_current_active_use
 def update_my_profile(
     profile_update: UserProfileUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """Update the current user's name and/or bio."""
+    # The principal is a cached snapshot; load the row to write to it
+    db_user = user_crud.get_by_id(db, user_id=current_user.id)
+    if not db_user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    
     update_data = profile_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(db_user, field, value)
     db.commit()
-    db.refresh(current_user)
-    return current_user
\ No newline at end of file
+    db.refresh(db_user)
+    return db_user
\ No newline at end of file
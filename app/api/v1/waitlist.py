@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from typing import List
 from app.database import get_db
 from app.schema.waitlist import WaitlistCreate, WaitlistResponse
@@ -36,7 +37,12 @@ def join_waitlist(
     
     # Create waitlist entry
     db_entry = waitlist_crud.create(db, user_id=current_user.id, course_id=waitlist_in.course_id)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Unique (user_id, course_id) index caught a concurrent duplicate request
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Already on waitlist for this course")
     db.refresh(db_entry)
     return db_entry
 
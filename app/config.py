@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -7,17 +8,96 @@ class Settings(BaseSettings):
     
     # Database key
     DATABASE_URL: str
+    # Connection pool, per engine per uvicorn worker (the sync and async engines each get one)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds, -1 disables
+    # Pre-ping costs a round trip per checkout; without it stale connections surface
+    # as one failed request and are then discarded by the pool
+    DB_POOL_PRE_PING: bool = True
     
     # Security key
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Authenticated user lookups cached per process (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    # Verified JWTs cached until their exp (0 disables)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    # Rate limiting: memory:// counts per process; use redis://host:6379/1 to share limits across workers
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: Literal["sliding-window-counter", "moving-window", "fixed-window"] = "sliding-window-counter"
+    RATE_LIMIT_LOGIN: str = "5/minute"  # per client IP
+    RATE_LIMIT_ENROLLMENT: str = "10/minute"  # per user
+    RATE_LIMIT_SEARCH: str = "30/minute"  # per user, or per IP when anonymous
+    # Password hashing
+    # New hashes use PASSWORD_HASH_SCHEME; other schemes still verify and are upgraded on login
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "argon2"] = "argon2"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+    
+    # Cache key
+    # Optional shared tier for the course outline cache (e.g. redis://localhost:6379/0)
+    REDIS_URL: Optional[str] = None
+    # Serialized course outlines per process; invalidated by content version bumps (0 disables)
+    OUTLINE_CACHE_MAX_SIZE: int = 1000
+    OUTLINE_CACHE_TTL_SECONDS: int = 300
+    # Encoded public catalog pages per process; short TTL bounds cross-worker staleness (0 disables)
+    CATALOG_CACHE_MAX_SIZE: int = 1000
+    CATALOG_CACHE_TTL_SECONDS: int = 10
     
     # Application  key
     APP_NAME: str = "Course Enrollment Platform"
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
     MOCK_EMAIL: bool = True
+    # Simulated provider handshake per mock connection (one per notification batch)
+    MOCK_EMAIL_CONNECT_SECONDS: float = 1
+    
+    # Email key (used when MOCK_EMAIL is off)
+    SMTP_HOST: Optional[str] = None
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    SMTP_USE_TLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 30
+    EMAIL_FROM: str = "no-reply@lms.local"
+    
+    # Notification outbox key (drained by `python -m app.worker`)
+    NOTIFICATION_BATCH_SIZE: int = 50
+    NOTIFICATION_POLL_INTERVAL_SECONDS: float = 2
+    # Attempts before a notification is dead-lettered; retries back off exponentially
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_RETRY_BASE_SECONDS: float = 30
+    NOTIFICATION_RETRY_MAX_SECONDS: float = 3600
+    # How long a claimed batch stays invisible to other workers; must exceed a batch's delivery time
+    NOTIFICATION_LEASE_SECONDS: float = 300
+    
+    # Upload key
+    UPLOAD_DIR: str = "uploads"
+    # Partial uploads and session chunks; kept out of the served UPLOAD_DIR but must be on
+    # the same filesystem, so finished files can be renamed into place atomically
+    UPLOAD_STAGING_DIR: str = "uploads-staging"
+    UPLOAD_MAX_BYTES: int = 512 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # Resumable upload sessions, for files too large to send in one request
+    UPLOAD_SESSION_MAX_BYTES: int = 20 * 1024 * 1024 * 1024
+    UPLOAD_SESSION_CHUNK_SIZE: int = 8 * 1024 * 1024
+    UPLOAD_SESSION_MAX_CHUNK_SIZE: int = 64 * 1024 * 1024
+    # Idle sessions (no chunk for this long) are removed by `python -m app.manage gc-uploads`
+    UPLOAD_SESSION_TTL_SECONDS: int = 86400
+    
+    # Enrollment key
+    # "lock": SELECT ... FOR UPDATE on the course row for the whole enrollment transaction
+    # "conditional": single guarded UPDATE on enrolled_count, row lock held for one statement
+    ENROLLMENT_SEAT_STRATEGY: Literal["lock", "conditional"] = "lock"
     
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
@@ -0,0 +1,117 @@
+import threading
+from itertools import chain
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.singleflight import SingleFlight
+from app.models.course import Course
+
+
+class CatalogPage(NamedTuple):
+    etag: str
+    body: bytes
+    next_cursor: Optional[str]
+
+
+class CatalogCache:
+    """
+    Encoded pages of the public course catalog, keyed by the normalized query.
+
+    Every key carries the cache generation, which is bumped after any commit that
+    touched a course, so later requests stop matching older pages. Concurrent misses
+    for the same page are coalesced into one database load.
+
+    Enrollment, waitlist and review counters are not watched: they change constantly
+    while registration is open and would leave the cache empty. Like writes seen by
+    other workers (generations are per process), they show up when pages expire,
+    hence the short TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.flights = SingleFlight()
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        skip: int,
+        limit: int,
+        after: Optional[str],
+        search: Optional[str],
+        category: Optional[str],
+        difficulty: Optional[str],
+        min_rating: Optional[float],
+    ) -> tuple:
+        # Equivalent queries share one entry: blank and falsy filters are ignored by
+        # the query (see CRUDCourse._active_statement), search is case-insensitive,
+        # and skip is not applied once a cursor is given
+        search = " ".join(search.lower().split()) if search else None
+        return (
+            self.generation,
+            None if after else skip,
+            limit,
+            after or None,
+            search or None,
+            category or None,
+            difficulty or None,
+            float(min_rating) if min_rating else None,
+        )
+
+    async def get_or_load(self, key: tuple, loader: Callable[[], Awaitable[CatalogPage]]) -> CatalogPage:
+        page = self.pages.get(key)
+        if page is not None:
+            return page
+
+        async def load_and_store() -> CatalogPage:
+            page = await loader()
+            self.pages.set(key, page)
+            return page
+
+        return await self.flights.do(key, load_and_store)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    def clear(self) -> None:
+        self.invalidate()
+        self.pages.clear()
+
+    def stats(self) -> dict:
+        stats = self.pages.stats()
+        stats.update(generation=self.generation, **self.flights.stats())
+        return stats
+
+
+catalog_cache = CatalogCache(
+    maxsize=settings.CATALOG_CACHE_MAX_SIZE,
+    ttl=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+
+
+# Models whose writes invalidate catalog pages; counter changes wait for the TTL
+CATALOG_MODELS = (Course,)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_catalog_writes(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here
+    if any(isinstance(obj, CATALOG_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info["catalog_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session):
+    # Only after commit: a page loaded before that would still show the old rows
+    if session.info.pop("catalog_changed", False):
+        catalog_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_catalog_writes(session):
+    session.info.pop("catalog_changed", None)
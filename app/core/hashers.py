@@ -0,0 +1,74 @@
+import bcrypt
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from app.config import settings
+
+
+class BcryptHasher:
+    scheme = "bcrypt"
+
+    def __init__(self, rounds: int):
+        self.rounds = rounds
+
+    def identify(self, hashed_password: str) -> bool:
+        return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        # $2b$12$... -> cost factor is the third field
+        return int(hashed_password.split("$")[2]) != self.rounds
+
+
+class Argon2Hasher:
+    scheme = "argon2"
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int):
+        self._hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=Type.ID,
+        )
+
+    def identify(self, hashed_password: str) -> bool:
+        return hashed_password.startswith("$argon2")
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        try:
+            return self._hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed_password)
+
+
+HASHERS = {
+    "bcrypt": BcryptHasher(rounds=settings.BCRYPT_ROUNDS),
+    "argon2": Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+}
+
+
+def get_hasher(scheme: str):
+    return HASHERS[scheme]
+
+
+def identify_hasher(hashed_password: str):
+    for hasher in HASHERS.values():
+        if hasher.identify(hashed_password):
+            return hasher
+    return None
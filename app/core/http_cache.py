@@ -0,0 +1,36 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+# Shared catalog data: any cache may store it but must revalidate before reuse
+PUBLIC_REVALIDATE = "public, no-cache"
+# Per-user data (enrollment-gated content): browser cache only, always revalidated
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """Weak validator over the given version parts (timestamps, counts, content digests)."""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match uses weak comparison: the W/ prefix is ignored on both sides."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_validators(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
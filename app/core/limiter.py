@@ -1,8 +1,71 @@
+import logging
+import os
+import time
+from typing import Callable
+
+from fastapi import HTTPException, Request, status
+from limits import parse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-import os
 
+from app.config import settings
+from app.core.security import decode_access_token
+
+logger = logging.getLogger("app")
+
+
+def get_user_or_ip(request: Request) -> str:
+    """
+    Rate-limit key: the authenticated user when the request carries a valid bearer
+    token, so users behind one NAT do not share a budget; otherwise the client IP.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = decode_access_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    return f"ip:{get_remote_address(request)}"
+
+
+# Counters live in RATE_LIMIT_STORAGE_URI: memory:// is per process, so with several
+# workers or nodes point it at Redis to make limits global. The sliding-window-counter
+# strategy is a single atomic script per check on Redis; headers stay disabled because
+# they would cost a second round trip.
 limiter = Limiter(
     key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+    key_prefix="ratelimit",
+    # Keep limiting per process while the shared storage is unreachable
+    in_memory_fallback_enabled=True,
     enabled=os.getenv("TESTING", "false").lower() != "true"
 )
+
+
+def limit_when(limit_value: str, scope: str, applies: Callable[[Request], bool], key_func=get_user_or_ip):
+    """
+    Dependency counterpart of @limiter.limit for limits that only cover some requests
+    of an endpoint (slowapi's exempt_when cannot see the request). Shares the
+    limiter's storage and strategy; requests it does not apply to cost nothing.
+    """
+    item = parse(limit_value)
+
+    def check(request: Request) -> None:
+        if not limiter.enabled or not applies(request):
+            return
+        identifiers = ("ratelimit", key_func(request), scope)
+        try:
+            allowed = limiter.limiter.hit(item, *identifiers)
+        except Exception:
+            # An unreachable store must not take the endpoint down with it
+            logger.warning(f"Rate limit storage unavailable, not limiting {scope}", exc_info=True)
+            return
+        if not allowed:
+            reset_at, _ = limiter.limiter.get_window_stats(item, *identifiers)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {item}",
+                headers={"Retry-After": str(max(1, int(reset_at - time.time())))},
+            )
+
+    return check
@@ -1,73 +1,159 @@
+import asyncio
 import logging
+import smtplib
+import uuid
+from collections import defaultdict
+from email.message import EmailMessage
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
 from app.config import settings
+from app.models.notification import NotificationKind
 
 logger = logging.getLogger("app")
 
-async def send_enrollment_notification(user_email: str, course_title: str):
-    """
-    Mock email notification service. 
-    In production, this would use an SMTP server or an API like SendGrid/SES.
-    """
-    message = f"NOTIFICATION: Enrollment successful! User {user_email} has enrolled in '{course_title}'."
-    
-    if settings.MOCK_EMAIL:
-        # Simulate some processing delay
-        import asyncio
-        await asyncio.sleep(1)
-        logger.info(message)
-    else:
-        # Actual email logic would go here
-        pass
+# Request handlers only add rows to the notification outbox (see notification_crud.enqueue);
+# the worker process renders and delivers them here
+MESSAGES = {
+    NotificationKind.ENROLLMENT: "NOTIFICATION: Enrollment successful! User {recipient} has enrolled in '{course_title}'.",
+    NotificationKind.WAITLIST_JOINED: "NOTIFICATION: Waitlist joined! User {recipient} is now on the waitlist for '{course_title}'.",
+    NotificationKind.WAITLIST_PROMOTION: "NOTIFICATION: Waitlist Promotion! User {recipient} has been automatically enrolled in '{course_title}' from the waitlist.",
+    NotificationKind.WELCOME: "NOTIFICATION: Welcome to LMS Pro, {user_name}! We're excited to have you on board.",
+    NotificationKind.LOGIN: "NOTIFICATION: New login detected for {recipient} from IP: {ip_address}.",
+}
 
-async def send_waitlist_notification(user_email: str, course_title: str):
-    """
-    Mock waitlist notification service.
-    """
-    message = f"NOTIFICATION: Waitlist joined! User {user_email} is now on the waitlist for '{course_title}'."
-    
-    if settings.MOCK_EMAIL:
-        import asyncio
-        await asyncio.sleep(1)
-        logger.info(message)
-    else:
-        pass
+SUBJECTS = {
+    NotificationKind.ENROLLMENT: "Enrollment confirmed",
+    NotificationKind.WAITLIST_JOINED: "You joined a waitlist",
+    NotificationKind.WAITLIST_PROMOTION: "You got a seat",
+    NotificationKind.WELCOME: "Welcome to LMS Pro",
+    NotificationKind.LOGIN: "New login to your account",
+}
 
-async def send_waitlist_promotion_notification(user_email: str, course_title: str):
-    """
-    Mock waitlist promotion notification service.
-    Called when a student is automatically enrolled from the waitlist.
-    """
-    message = f"NOTIFICATION: Waitlist Promotion! User {user_email} has been automatically enrolled in '{course_title}' from the waitlist."
-    
-    if settings.MOCK_EMAIL:
-        import asyncio
-        await asyncio.sleep(1)
-        logger.info(message)
-    else:
-        pass
 
-async def send_welcome_email(user_email: str, user_name: str):
+class Event(NamedTuple):
+    """One outbox notification as handed to the dispatcher."""
+    id: uuid.UUID
+    kind: NotificationKind
+    recipient: str
+    payload: dict
+
+
+class Message(NamedTuple):
+    recipient: str
+    subject: str
+    body: str
+
+
+def render(kind: NotificationKind, recipient: str, payload: dict) -> str:
+    return MESSAGES[kind].format(recipient=recipient, **payload)
+
+
+def compose(recipient: str, events: Sequence[Event]) -> Message:
+    """One message for everything a recipient is due; several events become a digest."""
+    if len(events) == 1:
+        event = events[0]
+        return Message(recipient, SUBJECTS[event.kind], render(event.kind, recipient, event.payload))
+    lines = [f"- {render(event.kind, recipient, event.payload)}" for event in events]
+    return Message(recipient, f"{len(events)} updates from LMS Pro", "\n".join(lines))
+
+
+class MockTransport:
     """
-    Mock welcome email service.
+    Mock email notification service, used while MOCK_EMAIL is set: logs each message.
+    Connecting costs MOCK_EMAIL_CONNECT_SECONDS to stand in for a provider handshake.
     """
-    message = f"NOTIFICATION: Welcome to LMS Pro, {user_name}! We're excited to have you on board."
-    
-    if settings.MOCK_EMAIL:
-        import asyncio
-        await asyncio.sleep(1)
-        logger.info(message)
-    else:
+
+    async def __aenter__(self):
+        await asyncio.sleep(settings.MOCK_EMAIL_CONNECT_SECONDS)
+        return self
+
+    async def __aexit__(self, *exc_info):
         pass
 
-async def send_login_notification(user_email: str, ip_address: str):
+    async def send(self, message: Message):
+        logger.info(message.body)
+
+
+class SMTPTransport:
+    """One SMTP session; every message of a batch is sent over the same connection."""
+
+    def __init__(self):
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        try:
+            if settings.SMTP_USE_TLS:
+                smtp.starttls()
+            if settings.SMTP_USERNAME:
+                smtp.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    async def __aenter__(self):
+        # smtplib blocks; its calls run in the default thread pool
+        self._smtp = await asyncio.to_thread(self._connect)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        try:
+            await asyncio.to_thread(self._smtp.quit)
+        except smtplib.SMTPException:
+            self._smtp.close()
+
+    async def send(self, message: Message):
+        email = EmailMessage()
+        email["From"] = settings.EMAIL_FROM
+        email["To"] = message.recipient
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+        await asyncio.to_thread(self._smtp.send_message, email)
+
+
+def get_transport():
+    return MockTransport() if settings.MOCK_EMAIL else SMTPTransport()
+
+
+class NotificationDispatcher:
     """
-    Mock login security alert.
+    Deliver a batch of notifications: the events for each recipient are merged into
+    one message, and all of the batch's messages share one transport connection.
     """
-    message = f"NOTIFICATION: New login detected for {user_email} from IP: {ip_address}."
-    
-    if settings.MOCK_EMAIL:
-        import asyncio
-        await asyncio.sleep(1)
-        logger.info(message)
-    else:
-        pass
+
+    def __init__(self, transport_factory: Callable = get_transport):
+        self.transport_factory = transport_factory
+        self.batches = 0
+        self.events = 0
+        self.messages = 0
+
+    async def dispatch(self, events: Sequence[Event]) -> Dict[uuid.UUID, Optional[Exception]]:
+        """Returns the outcome per event id: None when sent, else the error."""
+        by_recipient: Dict[str, List[Event]] = defaultdict(list)
+        for event in events:
+            by_recipient[event.recipient].append(event)
+
+        outcomes: Dict[uuid.UUID, Optional[Exception]] = {}
+        try:
+            async with self.transport_factory() as transport:
+                for recipient, recipient_events in by_recipient.items():
+                    try:
+                        await transport.send(compose(recipient, recipient_events))
+                        error = None
+                        self.messages += 1
+                    except Exception as e:
+                        # e.g. a rejected address: only this recipient's events fail
+                        error = e
+                    for event in recipient_events:
+                        outcomes[event.id] = error
+        except Exception as e:
+            # Connecting (or closing) failed; whatever has no outcome yet was not sent
+            for event in events:
+                outcomes.setdefault(event.id, e)
+
+        self.batches += 1
+        self.events += len(events)
+        return outcomes
+
+    def stats(self) -> dict:
+        return {"batches": self.batches, "events": self.events, "messages": self.messages}
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional
+import uuid
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.http_cache import weak_etag
+
+
+logger = logging.getLogger("app")
+
+
+class CachedOutline(NamedTuple):
+    # Digest of the body itself, so it stays valid across workers and restarts
+    etag: str
+    body: bytes
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedOutline":
+        return cls(etag=weak_etag(hashlib.sha256(body).hexdigest()), body=body)
+
+
+class OutlineCache:
+    """
+    Serialized course outlines keyed by (course_id, content version, variant).
+
+    Writers never delete entries: the module/lesson write handlers bump the course's
+    version after committing, and readers simply stop asking for the old key. A reader
+    that loaded the outline just before a bump can only store it under the old version,
+    so a stale outline is never served after the bump is visible.
+
+    Tiers:
+      * in-process LRU (always) - a hit costs no I/O at all without Redis
+      * Redis (when REDIS_URL is set) - shares entries between workers and holds the
+        authoritative version counter, so a bump in one worker invalidates all of them.
+        Reading the version is then one Redis round trip per request.
+    Without Redis each worker only sees its own bumps; other workers serve the
+    previous outline until their entry's TTL runs out.
+    """
+
+    VARIANTS = ("full", "outline")
+
+    def __init__(self, maxsize: int, ttl: int, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self._versions: Dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+        self._redis = redis.Redis.from_url(redis_url) if redis_url else None
+        self._aioredis = aioredis.Redis.from_url(redis_url) if redis_url else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.enabled
+
+    @staticmethod
+    def _version_key(course_id: uuid.UUID) -> str:
+        return f"outline:version:{course_id}"
+
+    @staticmethod
+    def _entry_key(course_id: uuid.UUID, version: int, variant: str) -> str:
+        return f"outline:{course_id}:{version}:{variant}"
+
+    def _redis_failed(self, operation: str, error: Exception) -> None:
+        self.redis_errors += 1
+        logger.warning(f"Outline cache: Redis {operation} failed, using the local tier only: {error}")
+
+    async def current_version(self, course_id: uuid.UUID) -> Optional[int]:
+        """
+        The course's content version, or None when Redis holds it but cannot be reached.
+        The local counter is no substitute then: it counts differently, so its value could
+        match an older entry stored under a Redis version. Callers load from the database.
+        """
+        if self._aioredis is not None:
+            try:
+                value = await self._aioredis.get(self._version_key(course_id))
+                return int(value or 0)
+            except redis.RedisError as e:
+                self._redis_failed("version read", e)
+                return None
+        with self._lock:
+            return self._versions.get(course_id, 0)
+
+    async def get(self, course_id: uuid.UUID, version: int, variant: str) -> Optional[CachedOutline]:
+        if not self.enabled:
+            return None
+        key = self._entry_key(course_id, version, variant)
+        entry = self.local.get(key)
+        if entry is not None or self._aioredis is None:
+            return entry
+        try:
+            body = await self._aioredis.get(key)
+        except redis.RedisError as e:
+            self._redis_failed("get", e)
+            return None
+        if body is None:
+            return None
+        self.redis_hits += 1
+        entry = CachedOutline.from_body(body)
+        self.local.set(key, entry)
+        return entry
+
+    async def set(self, course_id: uuid.UUID, version: int, variant: str, body: bytes) -> CachedOutline:
+        entry = CachedOutline.from_body(body)
+        if not self.enabled:
+            return entry
+        key = self._entry_key(course_id, version, variant)
+        self.local.set(key, entry)
+        if self._aioredis is not None:
+            try:
+                await self._aioredis.set(key, body, ex=self.ttl)
+            except redis.RedisError as e:
+                self._redis_failed("set", e)
+        return entry
+
+    def bump(self, course_id: uuid.UUID) -> None:
+        """Invalidate every cached outline of the course. Call after the write has committed."""
+        with self._lock:
+            self._versions[course_id] = self._versions.get(course_id, 0) + 1
+        if self._redis is not None:
+            try:
+                self._redis.incr(self._version_key(course_id))
+            except redis.RedisError as e:
+                self._redis_failed("version bump", e)
+
+    def stats(self) -> dict:
+        stats = self.local.stats()
+        stats.update(
+            redis=self._redis is not None,
+            redis_hits=self.redis_hits,
+            redis_errors=self.redis_errors,
+        )
+        return stats
+
+
+outline_cache = OutlineCache(
+    maxsize=settings.OUTLINE_CACHE_MAX_SIZE,
+    ttl=settings.OUTLINE_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL
+)
@@ -0,0 +1,57 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import Response
+from sqlalchemy import tuple_
+
+
+# Listings are walked in (created_at, id) order: id breaks ties between rows
+# created in the same instant, so the ordering is total and stable
+Cursor = Tuple[datetime, uuid.UUID]
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID) -> str:
+    """Opaque, URL-safe token for the position just after the given row."""
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset(stmt, model, after: Optional[Cursor]):
+    """Order stmt by (created_at, id) and, given a cursor, start just after it."""
+    stmt = stmt.order_by(model.created_at, model.id)
+    if after is not None:
+        stmt = stmt.where(tuple_(model.created_at, model.id) > tuple_(*after))
+    return stmt
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Cursor for the page after items; None for a short page, which is the last one."""
+    if items and len(items) == limit:
+        last = items[-1]
+        return encode_cursor(last.created_at, last.id)
+    return None
+
+
+def set_next_cursor(response: Response, items: Sequence, limit: int) -> None:
+    """
+    Advertise the cursor for the following page in a response header, so list
+    bodies keep their shape.
+    """
+    cursor = next_cursor(items, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,87 @@
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the hashing pool already has its maximum number of calls queued."""
+
+
+class PasswordHashingPool:
+    """
+    Dedicated, size-limited executor for password hashing work.
+
+    At most max_workers hashes run at once and at most max_queue more wait behind them.
+    Anything beyond that is rejected immediately instead of parking another request thread
+    for the full hashing time, so a login storm cannot starve the other endpoints.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, use_processes: bool = False):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.use_processes = use_processes
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so importing the app does not fork worker processes
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    def run(self, fn: Callable, *args):
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordPoolSaturated()
+            self.in_flight += 1
+            executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args).result()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "executor": "process" if self.use_processes else "thread",
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    use_processes=settings.PASSWORD_HASH_EXECUTOR == "process",
+)
+
+
+def password_pool_saturated_handler(request: Request, exc: PasswordPoolSaturated):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
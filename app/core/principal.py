@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from itertools import chain
+from typing import Optional
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Snapshot of the authenticated user with the fields needed for role/active checks
+    and for UserResponse. Detached from any session, so it is safe to share between requests.
+    """
+    id: uuid.UUID
+    email: str
+    name: str
+    role: UserRole
+    is_active: bool
+    bio: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            role=user.role,
+            is_active=user.is_active,
+            bio=user.bio,
+        )
+
+
+# Keyed by user id
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_user_writes(session, flush_context):
+    # Profile edits, role changes and deactivation must not be served stale
+    changed = {obj.id for obj in chain(session.dirty, session.deleted) if isinstance(obj, User)}
+    if changed:
+        session.info.setdefault("principals_changed", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session):
+    # Only after commit: a request reading the user before that would re-cache the old row
+    for user_id in session.info.pop("principals_changed", ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_writes(session):
+    session.info.pop("principals_changed", None)
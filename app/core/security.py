@@ -1,21 +1,37 @@
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
-import bcrypt
+import hashlib
+import time
 from app.config import settings
+from app.core.cache import TTLCache
+from app.core.hashers import get_hasher, identify_hasher
+
+
+# Recently verified tokens: sha256(token) + secret fingerprint -> decoded payload.
+# Entries live until the token's own exp, so expiry is still enforced on hits.
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_SIZE, ttl=None)
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return bcrypt.checkpw(
-        plain_password.encode('utf-8'),
-        hashed_password.encode('utf-8')
-    )
+    # Dispatch on the stored hash so legacy bcrypt hashes keep working
+    hasher = identify_hasher(hashed_password)
+    if hasher is None:
+        return False
+    return hasher.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return get_hasher(settings.PASSWORD_HASH_SCHEME).hash(password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the hash uses another scheme or outdated cost parameters."""
+    preferred = get_hasher(settings.PASSWORD_HASH_SCHEME)
+    if not preferred.identify(hashed_password):
+        return True
+    return preferred.needs_rehash(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -32,9 +48,27 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+@lru_cache(maxsize=4)
+def _key_fingerprint(secret_key: str, algorithm: str) -> bytes:
+    # Part of the cache key, so a rotated secret never matches entries verified with the old one
+    return hashlib.sha256(f"{algorithm}:{secret_key}".encode('utf-8')).digest()
+
+
 def decode_access_token(token: str):
+    cache_key = (
+        hashlib.sha256(token.encode('utf-8')).digest(),
+        _key_fingerprint(settings.SECRET_KEY, settings.ALGORITHM),
+    )
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(cache_key, dict(payload), ttl=exp - time.time())
+    return payload
\ No newline at end of file
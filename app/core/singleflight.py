@@ -0,0 +1,82 @@
+import asyncio
+import functools
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key (the leader) runs the loader; callers arriving while
+    it is in flight await the leader's result instead of repeating the work. Nothing
+    is retained afterwards - pair it with a cache for that. Coalescing is per event
+    loop, i.e. per uvicorn worker.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.followers += 1
+            try:
+                # shield: a follower's own cancellation must not cancel the shared work
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    # The leader was cancelled (e.g. its client went away); take over
+                    return await self.do(key, loader)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.leaders += 1
+        try:
+            result = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved: there may be no followers to do it
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def coalesce(self, key: Callable[..., Hashable]):
+        """
+        Decorator form of do() for async functions. key receives the call's arguments
+        and returns the coalescing key; leave out anything request-specific, such as
+        the session, that does not change the result.
+
+        Followers receive the very object the leader returned, so return plain data
+        (schemas, bytes) rather than ORM instances bound to the leader's session.
+        """
+        def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs) -> T:
+                return await self.do(key(*args, **kwargs), lambda: func(*args, **kwargs))
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
+
+
+# One group per hot read endpoint, so /system/stats reports their coalescing separately
+course_flights = SingleFlight()
+outline_flights = SingleFlight()
+review_flights = SingleFlight()
@@ -0,0 +1,240 @@
+import hashlib
+import os
+import re
+import shutil
+import time
+import uuid
+from typing import AsyncIterator, List, NamedTuple, Optional, Set, Tuple
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+from app.config import settings
+
+# Under UPLOAD_STAGING_DIR. Uploads are written here first and moved into place once
+# complete; a rename within one filesystem is atomic, so a partial file is never served
+INCOMING_DIR = "incoming"
+# Chunks of resumable upload sessions, one directory per session
+SESSIONS_DIR = "sessions"
+# Stored files whose last reference is being deleted, until that delete commits
+RETIRED_DIR = "retired"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class ChunkSizeMismatch(Exception):
+    pass
+
+
+class StagedFile(NamedTuple):
+    temp_path: str
+    sha256: str
+    size: int
+
+
+# File names content_path produces; anything else in UPLOAD_DIR (such as uploads saved
+# before content addressing) is never touched by the orphan sweep
+_FAN_OUT = re.compile(r"^[0-9a-f]{2}$")
+_CONTENT_NAME = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]{1,10})?$")
+
+
+def content_path(sha256: str, extension: str) -> str:
+    """Content-addressed location relative to UPLOAD_DIR, fanned out over two directory levels."""
+    return os.path.join(sha256[:2], sha256[2:4], sha256 + extension.lower())
+
+
+def public_url(path: str) -> str:
+    return "/uploads/" + path.replace(os.sep, "/")
+
+
+async def stage_upload(file: UploadFile, max_bytes: Optional[int] = None) -> StagedFile:
+    """
+    Copy an upload to a temporary file chunk by chunk, hashing as it goes, without
+    blocking the event loop. Raises UploadTooLarge (and removes the partial copy)
+    as soon as more than max_bytes (default UPLOAD_MAX_BYTES) have been read.
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES if max_bytes is None else max_bytes
+    incoming = os.path.join(settings.UPLOAD_STAGING_DIR, INCOMING_DIR)
+    await aiofiles.os.makedirs(incoming, exist_ok=True)
+    temp_path = os.path.join(incoming, f"{uuid.uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        await discard(temp_path)
+        raise
+    return StagedFile(temp_path, digest.hexdigest(), size)
+
+
+async def publish(staged: StagedFile, path: str) -> None:
+    """Move a staged upload to its content address; an existing copy is simply replaced by identical bytes."""
+    target = os.path.join(settings.UPLOAD_DIR, path)
+    await aiofiles.os.makedirs(os.path.dirname(target), exist_ok=True)
+    await aiofiles.os.replace(staged.temp_path, target)
+
+
+async def discard(temp_path: str) -> None:
+    try:
+        await aiofiles.os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def retire_stored(path: str) -> Optional[str]:
+    """
+    Move a stored file out of UPLOAD_DIR ahead of committing the removal of its row.
+    Returns where it went, for restore_stored or remove_retired; None if it was missing.
+    """
+    retired = os.path.join(settings.UPLOAD_STAGING_DIR, RETIRED_DIR)
+    os.makedirs(retired, exist_ok=True)
+    retired_path = os.path.join(retired, f"{uuid.uuid4()}.retired")
+    try:
+        os.replace(os.path.join(settings.UPLOAD_DIR, path), retired_path)
+    except FileNotFoundError:
+        return None
+    return retired_path
+
+
+def restore_stored(retired_path: str, path: str) -> None:
+    os.replace(retired_path, os.path.join(settings.UPLOAD_DIR, path))
+
+
+def remove_retired(retired_path: str) -> None:
+    try:
+        os.remove(retired_path)
+    except FileNotFoundError:
+        pass
+
+
+def session_dir(session_id: uuid.UUID) -> str:
+    return os.path.join(settings.UPLOAD_STAGING_DIR, SESSIONS_DIR, str(session_id))
+
+
+async def write_chunk(session_id: uuid.UUID, index: int, body: AsyncIterator[bytes], expected_size: int) -> None:
+    """
+    Stream one chunk of a session to disk. The chunk only counts as received once it
+    is complete: it is written under a temporary name and renamed into place. Raises
+    ChunkSizeMismatch, keeping nothing, unless exactly expected_size bytes arrive.
+    """
+    directory = session_dir(session_id)
+    await aiofiles.os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f"{index}.{uuid.uuid4()}.tmp")
+    size = 0
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            async for data in body:
+                size += len(data)
+                if size > expected_size:
+                    raise ChunkSizeMismatch()
+                await out.write(data)
+        if size != expected_size:
+            raise ChunkSizeMismatch()
+        # Replacing makes a retried chunk idempotent
+        await aiofiles.os.replace(temp_path, os.path.join(directory, f"{index}.chunk"))
+    except BaseException:
+        await discard(temp_path)
+        raise
+
+
+async def received_chunks(session_id: uuid.UUID) -> Set[int]:
+    try:
+        names = await aiofiles.os.listdir(session_dir(session_id))
+    except FileNotFoundError:
+        return set()
+    return {int(name.split(".")[0]) for name in names if name.endswith(".chunk")}
+
+
+def index_ranges(indexes: Set[int]) -> List[Tuple[int, int]]:
+    """Collapse chunk indexes into inclusive [first, last] runs."""
+    ranges = []
+    for index in sorted(indexes):
+        if ranges and ranges[-1][1] == index - 1:
+            ranges[-1] = (ranges[-1][0], index)
+        else:
+            ranges.append((index, index))
+    return ranges
+
+
+async def assemble_chunks(session_id: uuid.UUID, chunk_count: int) -> StagedFile:
+    """
+    Concatenate a session's chunks, in order, into one staged file, hashing on the way.
+    Memory use is one UPLOAD_CHUNK_SIZE buffer whatever the file size.
+    """
+    incoming = os.path.join(settings.UPLOAD_STAGING_DIR, INCOMING_DIR)
+    await aiofiles.os.makedirs(incoming, exist_ok=True)
+    temp_path = os.path.join(incoming, f"{uuid.uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+    directory = session_dir(session_id)
+    try:
+        async with aiofiles.open(temp_path, "wb") as out:
+            for index in range(chunk_count):
+                async with aiofiles.open(os.path.join(directory, f"{index}.chunk"), "rb") as chunk:
+                    while data := await chunk.read(settings.UPLOAD_CHUNK_SIZE):
+                        size += len(data)
+                        digest.update(data)
+                        await out.write(data)
+    except BaseException:
+        await discard(temp_path)
+        raise
+    return StagedFile(temp_path, digest.hexdigest(), size)
+
+
+def remove_session_files(session_id: uuid.UUID) -> None:
+    shutil.rmtree(session_dir(session_id), ignore_errors=True)
+
+
+def remove_stale_files(max_age_seconds: float, live_sessions: Set[str], stored_paths: Set[str]) -> int:
+    """
+    Delete leftovers of interrupted uploads and deletes older than max_age_seconds: staged and retired files,
+    session directories that no longer belong to a live session, and published files
+    whose database row was never committed (stored_paths are the ones that were).
+    Returns the number of entries removed.
+    """
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for staged in (INCOMING_DIR, RETIRED_DIR):
+        staged_dir = os.path.join(settings.UPLOAD_STAGING_DIR, staged)
+        if os.path.isdir(staged_dir):
+            for entry in os.scandir(staged_dir):
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+    sessions = os.path.join(settings.UPLOAD_STAGING_DIR, SESSIONS_DIR)
+    if os.path.isdir(sessions):
+        for entry in os.scandir(sessions):
+            if entry.name not in live_sessions and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+    for path in _content_addressed_files():
+        full_path = os.path.join(settings.UPLOAD_DIR, path)
+        if path not in stored_paths and os.stat(full_path).st_mtime < cutoff:
+            os.remove(full_path)
+            removed += 1
+    return removed
+
+
+def _content_addressed_files():
+    """Paths, relative to UPLOAD_DIR, of the files laid out by content_path."""
+    if not os.path.isdir(settings.UPLOAD_DIR):
+        return
+    for first in os.scandir(settings.UPLOAD_DIR):
+        if not (first.is_dir() and _FAN_OUT.match(first.name)):
+            continue
+        for second in os.scandir(first.path):
+            if not (second.is_dir() and _FAN_OUT.match(second.name)):
+                continue
+            for entry in os.scandir(second.path):
+                match = _CONTENT_NAME.match(entry.name)
+                if entry.is_file() and match and match.group(1).startswith(first.name + second.name):
+                    yield os.path.join(first.name, second.name, entry.name)
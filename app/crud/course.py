@@ -1,10 +1,16 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from app.models.course import Course
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, func, update, select, table, literal_column
+from app.models.course import Course, SEARCH_CONFIG, SQLITE_FTS_TABLE, search_document, course_prerequisites
 from app.models.review import Review
+from app.models.enrollment import Enrollment
+from app.models.waitlist import WaitlistEntry
 from app.schema.course import CourseCreate, CourseUpdate
-from typing import Optional, List
+from app.core.pagination import Cursor, keyset
+from typing import Optional, List, Dict, Tuple
 import uuid
+import re
+from datetime import datetime
 
 
 class CRUDCourse:
@@ -37,45 +43,104 @@ class CRUDCourse:
     def get_by_code(self, db: Session, code: str):
         return db.query(Course).filter(Course.code == code).first()
     
-    def get_all_active(
-        self, 
-        db: Session, 
+    def _search_terms(self, search: str) -> List[str]:
+        # Word characters only: drops tsquery/FTS5 operators typed into the search box
+        return re.findall(r"\w+", search.lower())
+    
+    def _apply_search(self, stmt, search: str, dialect: str):
+        """Filter to matching courses and order by relevance (best first)."""
+        terms = self._search_terms(search)
+        if not terms:
+            return stmt
+        
+        if dialect == "postgresql":
+            # Every term must match, each as a prefix, for search-as-you-type
+            query = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+            document = search_document(Course.title, Course.code, Course.category, Course.description)
+            return stmt.where(document.op("@@")(query))\
+                .order_by(func.ts_rank_cd(document, query).desc(), Course.id)
+        
+        if dialect == "sqlite":
+            fts = table(SQLITE_FTS_TABLE)
+            match = " ".join(f'"{term}"*' for term in terms)
+            return stmt.join(fts, literal_column(f"{SQLITE_FTS_TABLE}.rowid") == literal_column("courses.rowid"))\
+                .where(literal_column(SQLITE_FTS_TABLE).op("MATCH")(match))\
+                .order_by(func.bm25(literal_column(SQLITE_FTS_TABLE), 10.0, 10.0, 4.0, 1.0), Course.id)
+        
+        # No full-text support on this backend: substring match, unranked
+        return stmt.where(
+            or_(
+                Course.title.ilike(f"%{search}%"),
+                Course.code.ilike(f"%{search}%")
+            )
+        )
+    
+    def _active_statement(
+        self,
+        dialect: str,
         skip: int = 0, 
         limit: int = 100,
         search: Optional[str] = None,
         category: Optional[str] = None,
         difficulty: Optional[str] = None,
-        min_rating: Optional[float] = None
+        min_rating: Optional[float] = None,
+        after: Optional[Cursor] = None
     ):
-        query = db.query(Course).filter(Course.is_active == True)
+        # Shared by the sync and async catalog queries
+        stmt = select(Course).where(Course.is_active == True)
         
         if search:
-            query = query.filter(
-                or_(
-                    Course.title.ilike(f"%{search}%"),
-                    Course.code.ilike(f"%{search}%")
-                )
-            )
+            # Relevance order has no stable key to resume from, so search pages by offset only
+            stmt = self._apply_search(stmt, search, dialect)
+        else:
+            stmt = keyset(stmt, Course, after)
         
         if category:
-            query = query.filter(Course.category == category)
+            stmt = stmt.where(Course.category == category)
             
         if difficulty:
-            query = query.filter(Course.difficulty_level == difficulty)
+            stmt = stmt.where(Course.difficulty_level == difficulty)
             
         if min_rating:
-            # Join with reviews and filter by average rating
-            avg_rating_subquery = db.query(
-                Review.course_id,
-                func.avg(Review.rating).label("avg_rating")
-            ).group_by(Review.course_id).subquery()
-            
-            query = query.join(
-                avg_rating_subquery,
-                Course.id == avg_rating_subquery.c.course_id
-            ).filter(avg_rating_subquery.c.avg_rating >= min_rating)
-            
-        return query.offset(skip).limit(limit).all()
+            # Precomputed, indexed average; unreviewed courses (NULL) never match
+            stmt = stmt.where(Course.average_rating >= min_rating)
+        
+        if after is None:
+            stmt = stmt.offset(skip)
+        return stmt.limit(limit)
+    
+    def get_all_active(self, db: Session, **filters):
+        dialect = db.get_bind().dialect.name
+        return db.scalars(self._active_statement(dialect, **filters)).all()
+    
+    async def get_all_active_async(self, db: AsyncSession, **filters):
+        dialect = db.get_bind().dialect.name
+        result = await db.scalars(self._active_statement(dialect, **filters))
+        return result.all()
+    
+    async def get_by_id_async(self, db: AsyncSession, course_id: uuid.UUID):
+        # Prerequisites are eager-loaded: lazy loads are not possible on an AsyncSession
+        result = await db.scalars(
+            select(Course)
+            .where(Course.id == course_id)
+            .options(selectinload(Course.prerequisites))
+        )
+        return result.first()
+    
+    async def get_catalog_version_async(self, db: AsyncSession) -> Tuple[Optional[datetime], int]:
+        """(latest updated_at, row count) over all courses: changes whenever any catalog page can."""
+        result = await db.execute(select(func.max(Course.updated_at), func.count(Course.id)))
+        return tuple(result.one())
+    
+    async def get_detail_version_async(self, db: AsyncSession, course_id: uuid.UUID) -> Tuple[Optional[datetime], int]:
+        """(latest updated_at, row count) over the course and its prerequisites, as shown by CourseWithDetails."""
+        prerequisite_ids = select(course_prerequisites.c.prerequisite_id)\
+            .where(course_prerequisites.c.course_id == course_id)
+        result = await db.execute(
+            select(func.max(Course.updated_at), func.count(Course.id))
+            .where(or_(Course.id == course_id, Course.id.in_(prerequisite_ids)))
+        )
+        return tuple(result.one())
     
     def get_all(self, db: Session, skip: int = 0, limit: int = 100):
         return db.query(Course).offset(skip).limit(limit).all()
@@ -98,6 +163,9 @@ class CRUDCourse:
         for field, value in update_data.items():
             setattr(db_course, field, value)
         
+        # A prerequisites-only change does not UPDATE the course row, so onupdate would not fire
+        db_course.updated_at = datetime.utcnow()
+        
         # db.commit() and db.refresh() removed for transaction management in API layer
         
         return db_course
@@ -127,7 +195,109 @@ class CRUDCourse:
         
         return db_course
 
+    def reserve_seat(self, db: Session, course_id: uuid.UUID) -> bool:
+        """
+        Claim one seat with a single guarded UPDATE; the row is only locked for this statement.
+        Returns False when the course is full, inactive or missing.
+        """
+        result = db.execute(
+            update(Course)
+            .where(
+                Course.id == course_id,
+                Course.is_active == True,
+                Course.enrolled_count < Course.capacity
+            )
+            .values(enrolled_count=Course.enrolled_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
     def get_by_instructor(self, db: Session, instructor_id: uuid.UUID):
         return db.query(Course).filter(Course.instructor_id == instructor_id).all()
 
+    def get_seat_counts(self, db: Session, course_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Tuple[int, int]]:
+        """
+        Enrollment and waitlist counts for a batch of courses in a single round trip.
+        Returns {course_id: (enrollment_count, waitlist_count)}.
+        """
+        if not course_ids:
+            return {}
+        
+        enrollment_counts = db.query(
+            Enrollment.course_id,
+            func.count(Enrollment.id).label("count")
+        ).filter(Enrollment.course_id.in_(course_ids)).group_by(Enrollment.course_id).subquery()
+        
+        waitlist_counts = db.query(
+            WaitlistEntry.course_id,
+            func.count(WaitlistEntry.id).label("count")
+        ).filter(WaitlistEntry.course_id.in_(course_ids)).group_by(WaitlistEntry.course_id).subquery()
+        
+        rows = db.query(
+            Course.id,
+            enrollment_counts.c.count,
+            waitlist_counts.c.count
+        ).outerjoin(enrollment_counts, Course.id == enrollment_counts.c.course_id)\
+         .outerjoin(waitlist_counts, Course.id == waitlist_counts.c.course_id)\
+         .filter(Course.id.in_(course_ids))\
+         .all()
+        
+        return {course_id: (enrolled or 0, waitlisted or 0) for course_id, enrolled, waitlisted in rows}
+
+    def rebuild_rating_stats(self, db: Session) -> int:
+        """
+        Recompute rating_sum/rating_count/average_rating for every course from the reviews table.
+        Returns the number of courses updated (the caller commits).
+        """
+        rating_sum = select(func.coalesce(func.sum(Review.rating), 0))\
+            .where(Review.course_id == Course.id).correlate(Course).scalar_subquery()
+        rating_count = select(func.count(Review.id))\
+            .where(Review.course_id == Course.id).correlate(Course).scalar_subquery()
+        average_rating = select(func.avg(Review.rating))\
+            .where(Review.course_id == Course.id).correlate(Course).scalar_subquery()
+        
+        result = db.execute(
+            update(Course)
+            .values(rating_sum=rating_sum, rating_count=rating_count, average_rating=average_rating)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def reconcile_seat_counters(self, db: Session, repair: bool = False, batch_size: int = 500):
+        """
+        Compare the denormalized enrolled_count/waitlist_count columns with the real row counts.
+        Returns one entry per drifted course; when repair is set the columns are corrected
+        (the caller commits).
+        """
+        drift = []
+        last_id = None
+        
+        while True:
+            query = db.query(Course).order_by(Course.id)
+            if last_id is not None:
+                query = query.filter(Course.id > last_id)
+            if repair:
+                query = query.with_for_update()
+            courses = query.limit(batch_size).all()
+            if not courses:
+                break
+            
+            counts = self.get_seat_counts(db, [c.id for c in courses])
+            for course in courses:
+                enrolled, waitlisted = counts.get(course.id, (0, 0))
+                if course.enrolled_count != enrolled or course.waitlist_count != waitlisted:
+                    drift.append({
+                        "course_id": course.id,
+                        "code": course.code,
+                        "stored": (course.enrolled_count, course.waitlist_count),
+                        "actual": (enrolled, waitlisted),
+                    })
+                    if repair:
+                        course.enrolled_count = enrolled
+                        course.waitlist_count = waitlisted
+            
+            last_id = courses[-1].id
+        
+        return drift
+
 course_crud = CRUDCourse()
\ No newline at end of file
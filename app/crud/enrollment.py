@@ -1,13 +1,20 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
 from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.course import Course
+from app.models.user import User
 from app.schema.enrollment import EnrollmentCreate, EnrollmentUpdate
-from typing import Optional, List
+from app.core.pagination import Cursor, keyset
+from typing import Optional, List, Iterator
 import uuid
 
 
 class CRUDEnrollment:
+    
+    # user and course are serialized by EnrollmentWithDetails. Both are many-to-one,
+    # so joining them into the same query costs no extra round trip and keeps limit/offset exact.
+    DETAIL_OPTIONS = (joinedload(Enrollment.user), joinedload(Enrollment.course))
 
     def get_by_id(self, db: Session, enrollment_id: uuid.UUID):
         return db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
@@ -25,22 +32,99 @@ class CRUDEnrollment:
             )
         ).first()
     
-    def get_all(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Enrollment).offset(skip).limit(limit).all()
+    async def get_by_user_and_course_async(
+        self, 
+        db: AsyncSession, 
+        user_id: uuid.UUID, 
+        course_id: uuid.UUID
+    ):
+        result = await db.scalars(
+            select(Enrollment).where(
+                Enrollment.user_id == user_id,
+                Enrollment.course_id == course_id
+            )
+        )
+        return result.first()
     
-    def get_by_user(self, db: Session, user_id: uuid.UUID):
-        return db.query(Enrollment).filter(Enrollment.user_id == user_id).all()
+    def get_all(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        with_details: bool = False
+    ):
+        stmt = keyset(select(Enrollment), Enrollment, after)
+        if with_details:
+            stmt = stmt.options(*self.DETAIL_OPTIONS)
+        if after is None:
+            stmt = stmt.offset(skip)
+        return db.scalars(stmt.limit(limit)).all()
+    
+    def get_by_user(self, db: Session, user_id: uuid.UUID, with_details: bool = False):
+        query = db.query(Enrollment).filter(Enrollment.user_id == user_id)
+        if with_details:
+            query = query.options(*self.DETAIL_OPTIONS)
+        return query.all()
+    
+    async def get_by_user_async(self, db: AsyncSession, user_id: uuid.UUID):
+        # Always with details: lazy loads are not possible on an AsyncSession
+        result = await db.scalars(
+            select(Enrollment)
+            .where(Enrollment.user_id == user_id)
+            .options(*self.DETAIL_OPTIONS)
+        )
+        return result.all()
 
     def get_by_course(
         self, 
         db: Session, 
         course_id: uuid.UUID, 
         skip: int = 0, 
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[Cursor] = None,
+        with_details: bool = False
     ):
-        return db.query(Enrollment).filter(
-            Enrollment.course_id == course_id
-        ).offset(skip).limit(limit).all()
+        stmt = keyset(select(Enrollment).where(Enrollment.course_id == course_id), Enrollment, after)
+        if with_details:
+            stmt = stmt.options(*self.DETAIL_OPTIONS)
+        if after is None:
+            stmt = stmt.offset(skip)
+        return db.scalars(stmt.limit(limit)).all()
+    
+    def iter_export_rows(
+        self,
+        db: Session,
+        course_id: Optional[uuid.UUID] = None,
+        status: Optional[EnrollmentStatus] = None,
+        batch_size: int = 1000
+    ) -> Iterator:
+        """
+        Stream flat enrollment rows (with student and course columns joined in) in
+        (created_at, id) order. yield_per fetches through a server-side cursor where
+        the driver supports one, so memory stays flat however many rows match.
+        """
+        stmt = select(
+            Enrollment.id,
+            Enrollment.created_at,
+            Enrollment.status,
+            Enrollment.grade,
+            Enrollment.user_id,
+            User.email.label("user_email"),
+            User.name.label("user_name"),
+            Enrollment.course_id,
+            Course.code.label("course_code"),
+            Course.title.label("course_title"),
+        ).join(User, Enrollment.user_id == User.id)\
+         .join(Course, Enrollment.course_id == Course.id)\
+         .order_by(Enrollment.created_at, Enrollment.id)
+        
+        if course_id:
+            stmt = stmt.where(Enrollment.course_id == course_id)
+        if status:
+            stmt = stmt.where(Enrollment.status == status)
+        
+        yield from db.execute(stmt.execution_options(yield_per=batch_size))
     
     def count_enrollments_for_course(self, db: Session, course_id: uuid.UUID):
         # Using with_for_update for atomic checks if needed, but count is usually okay
@@ -51,12 +135,14 @@ class CRUDEnrollment:
         self, 
         db: Session, 
         course_id: uuid.UUID, 
-        user_id: uuid.UUID
+        user_id: uuid.UUID,
+        seat_reserved: bool = False
     ):
         db_enrollment = Enrollment(
             user_id=user_id,
             course_id=course_id
         )
+        db_enrollment.seat_reserved = seat_reserved
         
         db.add(db_enrollment)
         # db.commit() and db.refresh() removed to allow transaction management in API layer
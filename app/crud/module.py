@@ -1,5 +1,8 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from app.models.module import Module
+from app.models.lesson import Lesson
 from app.schema.module import ModuleCreate, ModuleUpdate
 import uuid
 
@@ -20,6 +23,23 @@ class CRUDModule:
     
     def get_by_course(self, db: Session, course_id: uuid.UUID):
         return db.query(Module).filter(Module.course_id == course_id).order_by(Module.order).all()
+    
+    async def get_outline_async(self, db: AsyncSession, course_id: uuid.UUID, include_content: bool = False):
+        """
+        Modules of a course with their lessons in two queries: the modules, then every
+        lesson of those modules in one IN query. Without include_content the lesson
+        content_data bodies are never read from the database (accessing one raises).
+        """
+        lessons = selectinload(Module.lessons)
+        if not include_content:
+            lessons = lessons.defer(Lesson.content_data, raiseload=True)
+        result = await db.scalars(
+            select(Module)
+            .where(Module.course_id == course_id)
+            .order_by(Module.order)
+            .options(lessons)
+        )
+        return result.all()
 
     def update(self, db: Session, module_id: uuid.UUID, module_update: ModuleUpdate):
         db_module = self.get_by_id(db, module_id)
@@ -0,0 +1,86 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from app.models.notification import Notification, NotificationKind, NotificationStatus
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import uuid
+
+
+class CRUDNotification:
+    
+    def enqueue(self, db: Session, kind: NotificationKind, recipient: str, **payload) -> Notification:
+        """Add a notification to the outbox; it is sent once the caller's transaction commits."""
+        db_notification = Notification(kind=kind, recipient=recipient, payload=payload)
+        db.add(db_notification)
+        return db_notification
+    
+    def claim_batch(self, db: Session, batch_size: int, lease_seconds: float, now: Optional[datetime] = None) -> List[Notification]:
+        """
+        Lease up to batch_size due notifications to the calling worker (the caller commits).
+        A leased row is invisible to other workers until the lease ends, so a worker that
+        dies mid-delivery only delays its batch. Each claim counts as an attempt.
+        """
+        now = now or datetime.utcnow()
+        stmt = (
+            select(Notification)
+            .where(Notification.status == NotificationStatus.PENDING, Notification.available_at <= now)
+            .order_by(Notification.available_at)
+            .limit(batch_size)
+            # Concurrent workers skip each other's rows instead of queueing on them
+            .with_for_update(skip_locked=True)
+        )
+        notifications = db.scalars(stmt).all()
+        for notification in notifications:
+            notification.attempts += 1
+            notification.available_at = now + timedelta(seconds=lease_seconds)
+        return notifications
+    
+    def mark_sent(self, db: Session, notification_ids: List[uuid.UUID], now: Optional[datetime] = None) -> int:
+        """Record a batch's deliveries with one UPDATE (the caller commits)."""
+        if not notification_ids:
+            return 0
+        result = db.execute(
+            update(Notification)
+            .where(Notification.id.in_(notification_ids))
+            .values(status=NotificationStatus.SENT, sent_at=now or datetime.utcnow(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def mark_failed(
+        self,
+        db: Session,
+        notification_id: uuid.UUID,
+        error: str,
+        retry_at: Optional[datetime]
+    ):
+        """Schedule another attempt at retry_at, or dead-letter the notification when retry_at is None."""
+        db_notification = db.get(Notification, notification_id)
+        if db_notification:
+            db_notification.last_error = error
+            if retry_at is None:
+                db_notification.status = NotificationStatus.DEAD
+            else:
+                db_notification.available_at = retry_at
+        return db_notification
+    
+    def requeue_dead(self, db: Session) -> int:
+        """Give every dead-lettered notification a fresh set of attempts (the caller commits)."""
+        result = db.execute(
+            update(Notification)
+            .where(Notification.status == NotificationStatus.DEAD)
+            .values(status=NotificationStatus.PENDING, attempts=0, available_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def get_status_counts(self, db: Session) -> Dict[str, int]:
+        rows = db.execute(
+            select(Notification.status, func.count(Notification.id)).group_by(Notification.status)
+        ).all()
+        counts = {status.value: 0 for status in NotificationStatus}
+        counts.update({status.value: count for status, count in rows})
+        return counts
+
+
+notification_crud = CRUDNotification()
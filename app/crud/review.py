@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from app.models.review import Review
 from app.schema.review import ReviewCreate
+from app.core.pagination import Cursor, keyset
 import uuid
-from typing import List
+from typing import List, Optional
 
 
 class CRUDReview:
@@ -10,8 +13,24 @@ class CRUDReview:
     def get_by_id(self, db: Session, review_id: uuid.UUID):
         return db.query(Review).filter(Review.id == review_id).first()
     
-    def get_by_course(self, db: Session, course_id: uuid.UUID, skip: int = 0, limit: int = 100):
-        return db.query(Review).filter(Review.course_id == course_id).offset(skip).limit(limit).all()
+    async def get_by_course_async(
+        self,
+        db: AsyncSession,
+        course_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Cursor] = None
+    ):
+        # Reviewers are eager-loaded: lazy loads are not possible on an AsyncSession
+        stmt = keyset(
+            select(Review).where(Review.course_id == course_id).options(selectinload(Review.user)),
+            Review,
+            after
+        )
+        if after is None:
+            stmt = stmt.offset(skip)
+        result = await db.scalars(stmt.limit(limit))
+        return result.all()
     
     def create(self, db: Session, user_id: uuid.UUID, course_id: uuid.UUID, enrollment_id: uuid.UUID, review: ReviewCreate):
         db_review = Review(
@@ -0,0 +1,161 @@
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import delete, insert, select, update
+from app.models.upload import StoredFile, Upload, UploadSession, UploadSessionStatus
+from datetime import datetime
+from typing import List, Optional, Tuple
+import uuid
+
+
+class CRUDUpload:
+    
+    def get_by_id(self, db: Session, upload_id: uuid.UUID):
+        return db.query(Upload).filter(Upload.id == upload_id).first()
+    
+    async def create_async(
+        self,
+        db: AsyncSession,
+        sha256: str,
+        size: int,
+        path: str,
+        filename: Optional[str],
+        content_type: Optional[str],
+        uploaded_by: uuid.UUID
+    ) -> Tuple[Upload, str]:
+        """
+        Record an upload of the given content, creating its StoredFile on first sight.
+        Returns the Upload and the path where the content lives (the caller commits).
+        """
+        table = StoredFile.__table__
+        while True:
+            # Taking the reference locks the row, so a concurrent delete of the last
+            # reference either finishes first (no row: insert it again) or waits for us
+            stored_path = (await db.execute(
+                update(table)
+                .where(table.c.sha256 == sha256)
+                .values(ref_count=table.c.ref_count + 1)
+                .returning(table.c.path)
+            )).scalar_one_or_none()
+            if stored_path is not None:
+                break
+            try:
+                async with db.begin_nested():
+                    await db.execute(
+                        insert(table).values(
+                            sha256=sha256, path=path, size=size, ref_count=1, created_at=datetime.utcnow()
+                        )
+                    )
+                stored_path = path
+                break
+            except IntegrityError:
+                # The same content was stored by a concurrent upload; take a reference on that
+                continue
+        
+        db_upload = Upload(
+            sha256=sha256,
+            filename=filename,
+            content_type=content_type,
+            uploaded_by=uploaded_by
+        )
+        db.add(db_upload)
+        await db.flush()
+        return db_upload, stored_path
+    
+    def delete(self, db: Session, upload_id: uuid.UUID) -> Optional[str]:
+        """
+        Delete an upload. Returns the stored path when that was the content's last
+        reference - the row is gone and the caller removes the file after committing.
+        """
+        db_upload = self.get_by_id(db, upload_id)
+        if not db_upload:
+            return None
+        sha256 = db_upload.sha256
+        path = db_upload.stored_file.path
+        db.delete(db_upload)
+        db.flush()
+        # Conditional on the count, so a concurrent upload of the same content keeps the row
+        result = db.execute(
+            delete(StoredFile)
+            .where(StoredFile.sha256 == sha256, StoredFile.ref_count == 0)
+            .execution_options(synchronize_session=False)
+        )
+        return path if result.rowcount == 1 else None
+
+    
+    # --- Resumable upload sessions ---
+    
+    async def create_session_async(
+        self,
+        db: AsyncSession,
+        owner_id: uuid.UUID,
+        filename: str,
+        content_type: Optional[str],
+        size: int,
+        chunk_size: int
+    ) -> UploadSession:
+        db_session = UploadSession(
+            owner_id=owner_id,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            chunk_size=chunk_size
+        )
+        db.add(db_session)
+        return db_session
+    
+    async def get_session_async(self, db: AsyncSession, session_id: uuid.UUID) -> Optional[UploadSession]:
+        return await db.get(UploadSession, session_id)
+    
+    async def touch_session_async(self, db: AsyncSession, session_id: uuid.UUID) -> bool:
+        """Record activity on an open session; False when it is no longer accepting chunks."""
+        result = await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session_id, UploadSession.status == UploadSessionStatus.OPEN)
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    async def set_session_status_async(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        expected: UploadSessionStatus,
+        status: UploadSessionStatus
+    ) -> bool:
+        """Compare-and-set on the session status, so only one request can complete a session."""
+        result = await db.execute(
+            update(UploadSession)
+            .where(UploadSession.id == session_id, UploadSession.status == expected)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    async def delete_session_async(self, db: AsyncSession, session_id: uuid.UUID) -> None:
+        await db.execute(
+            delete(UploadSession)
+            .where(UploadSession.id == session_id)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def get_stored_paths(self, db: Session) -> List[str]:
+        return list(db.scalars(select(StoredFile.path)))
+    
+    def get_session_ids(self, db: Session) -> List[uuid.UUID]:
+        return list(db.scalars(select(UploadSession.id)))
+    
+    def delete_idle_sessions(self, db: Session, idle_since: datetime) -> List[uuid.UUID]:
+        """Delete sessions without activity since idle_since; returns their ids so the caller can remove their chunks."""
+        ids = list(db.scalars(select(UploadSession.id).where(UploadSession.updated_at < idle_since)))
+        if ids:
+            db.execute(
+                delete(UploadSession)
+                .where(UploadSession.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+        return ids
+
+
+upload_crud = CRUDUpload()
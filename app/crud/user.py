@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from app.models.user import User, UserRole
 from app.schema.user import UserCreate
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, verify_password, password_needs_rehash
+from app.core.password_pool import PasswordPoolSaturated, password_pool
 from typing import Optional
 import uuid
 
@@ -11,8 +14,8 @@ class CRUDUser:
 
     def create(self, db: Session, user: UserCreate):
 
-        # Hash the password
-        hashed_password = get_password_hash(user.password)
+        # Hash the password on the bounded hashing pool
+        hashed_password = password_pool.run(get_password_hash, user.password)
         
         # Creating user object
         db_user = User(
@@ -36,6 +39,10 @@ class CRUDUser:
         
         return db.query(User).filter(User.id == user_id).first()
     
+    async def get_by_id_async(self, db: AsyncSession, user_id: uuid.UUID) -> Optional[User]:
+        result = await db.scalars(select(User).where(User.id == user_id))
+        return result.first()
+    
     #authenticate while loging in
     def authenticate(self, db: Session, email: str, password: str):
         
@@ -46,7 +53,7 @@ class CRUDUser:
             return None
         
         # password check 
-        if not verify_password(password, user.hashed_password):
+        if not password_pool.run(verify_password, password, user.hashed_password):
             return None
         
         #user check
@@ -54,6 +61,14 @@ class CRUDUser:
         if not user.is_active:
             return None
         
+        # Transparently upgrade legacy bcrypt (or outdated-cost) hashes; caller commits
+        if password_needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = password_pool.run(get_password_hash, password)
+            except PasswordPoolSaturated:
+                # The password was correct; the upgrade can wait for the next login
+                pass
+        
         return user
 
 
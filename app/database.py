@@ -1,24 +1,159 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
 from app.config import settings
 
 
+class PoolStats:
+    """Checkout wait time and timeout counters for one engine's pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, waited: float, timed_out: bool):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+# Keyed by pool logging name, which SQLAlchemy carries over when a pool is recreated
+POOL_STATS = {}
+
+
+class InstrumentedPoolMixin:
+
+    def _do_get(self):
+        stats = POOL_STATS.setdefault(self._orig_logging_name, PoolStats())
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        stats.record(time.perf_counter() - start, timed_out=False)
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(database_url, name: str, poolclass) -> dict:
+    url = make_url(database_url)
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    # In-memory SQLite needs its single-connection pool
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_logging_name=name,
+    )
+    return options
+
+
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,  
-    echo=settings.DEBUG   
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL, "sync", InstrumentedQueuePool)
 )
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+# Async drivers for the same database, used by the async read endpoints
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(database_url: str):
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+async_engine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    **pool_options(settings.DATABASE_URL, "async", InstrumentedAsyncAdaptedQueuePool)
+)
+
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 Base = declarative_base()
 
 
+def pool_status(pool, name: str) -> dict:
+    """Point-in-time pool occupancy plus the cumulative checkout counters."""
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    status.update(POOL_STATS.get(name, PoolStats()).snapshot())
+    return status
+
+
+def get_pool_stats() -> dict:
+    return {
+        "sync": pool_status(engine.pool, "sync"),
+        "async": pool_status(async_engine.sync_engine.pool, "async"),
+    }
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
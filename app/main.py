@@ -43,6 +43,7 @@ from fastapi.responses import FileResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.limiter import limiter
+from app.core.password_pool import PasswordPoolSaturated, password_pool_saturated_handler
 import os
 
 from app.api.v1 import api_router
@@ -59,9 +60,10 @@ app = FastAPI(
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(PasswordPoolSaturated, password_pool_saturated_handler)
 
 # Create uploads directory if it doesn't exist
-os.makedirs("uploads", exist_ok=True)
+os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
 #  API routes FIRST
 app.include_router(api_router, prefix="/api/v1")
@@ -72,7 +74,7 @@ def health_check():
     return {"status": "healthy"}
 
 #  Uploads (only once)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
 
 # Static assets
 app.mount("/static", StaticFiles(directory="frontend"), name="static")
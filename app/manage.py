@@ -0,0 +1,115 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.manage reconcile-counters [--fix]
+    python -m app.manage rebuild-ratings
+    python -m app.manage requeue-notifications
+    python -m app.manage gc-uploads
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from app.database import SessionLocal
+from app.crud.course import course_crud
+from app.crud.notification import notification_crud
+from app.crud.upload import upload_crud
+from app.config import settings
+from app.core.storage import remove_session_files, remove_stale_files
+import app.models  # noqa: F401  (register all mappers)
+
+
+def reconcile_counters(args) -> int:
+    db = SessionLocal()
+    try:
+        drift = course_crud.reconcile_seat_counters(db, repair=args.fix)
+        for row in drift:
+            print(
+                f"{row['code']} ({row['course_id']}): "
+                f"stored enrolled/waitlist={row['stored']} actual={row['actual']}"
+            )
+        if args.fix:
+            db.commit()
+            print(f"Repaired {len(drift)} course(s)")
+        else:
+            print(f"{len(drift)} course(s) drifted" + (" (run with --fix to repair)" if drift else ""))
+        return 1 if drift and not args.fix else 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def rebuild_ratings(args) -> int:
+    db = SessionLocal()
+    try:
+        updated = course_crud.rebuild_rating_stats(db)
+        db.commit()
+        print(f"Rebuilt rating aggregates for {updated} course(s)")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def requeue_notifications(args) -> int:
+    db = SessionLocal()
+    try:
+        requeued = notification_crud.requeue_dead(db)
+        db.commit()
+        print(f"Requeued {requeued} dead-lettered notification(s)")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def gc_uploads(args) -> int:
+    db = SessionLocal()
+    try:
+        ttl = settings.UPLOAD_SESSION_TTL_SECONDS
+        expired = upload_crud.delete_idle_sessions(db, idle_since=datetime.utcnow() - timedelta(seconds=ttl))
+        db.commit()
+        for session_id in expired:
+            remove_session_files(session_id)
+        # Whatever is left on disk without a session or stored-file row
+        live = {str(session_id) for session_id in upload_crud.get_session_ids(db)}
+        removed = remove_stale_files(ttl, live, set(upload_crud.get_stored_paths(db)))
+        print(f"Expired {len(expired)} idle upload session(s), removed {removed} leftover file(s)")
+        return 0
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser("reconcile-counters", help="Detect and repair drift in course seat counters")
+    reconcile.add_argument("--fix", action="store_true", help="Write the recomputed counts back to the courses table")
+    reconcile.set_defaults(handler=reconcile_counters)
+
+    ratings = commands.add_parser("rebuild-ratings", help="Recompute course rating aggregates from the reviews table")
+    ratings.set_defaults(handler=rebuild_ratings)
+
+    requeue = commands.add_parser("requeue-notifications", help="Retry notifications that exhausted their delivery attempts")
+    requeue.set_defaults(handler=requeue_notifications)
+
+    gc = commands.add_parser("gc-uploads", help="Remove idle resumable upload sessions and files left by interrupted uploads")
+    gc.set_defaults(handler=gc_uploads)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,4 +4,6 @@ from app.models.enrollment import Enrollment, EnrollmentStatus
 from app.models.waitlist import WaitlistEntry
 from app.models.review import Review
 from app.models.module import Module
-from app.models.lesson import Lesson
\ No newline at end of file
+from app.models.lesson import Lesson
+from app.models.notification import Notification, NotificationKind, NotificationStatus
+from app.models.upload import StoredFile, Upload, UploadSession, UploadSessionStatus
\ No newline at end of file
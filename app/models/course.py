@@ -1,10 +1,34 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Table, Index, DDL, update, case, event, func, literal_column
+from sqlalchemy.orm import relationship, synonym
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from datetime import datetime
 import uuid
 
 
+# Full-text search on Postgres: a GIN expression index over a weighted tsvector.
+# Queries must build the vector with search_document() so the planner can match
+# the index expression.
+# Constants are rendered inline (not as bind parameters) for the same reason.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def search_document(title, code, category, description):
+    """Weighted tsvector over title/code (A), category (B) and description (C)."""
+    def weighted(column, weight):
+        return func.setweight(
+            func.to_tsvector(SEARCH_CONFIG, func.coalesce(column, literal_column("''"))),
+            literal_column(f"'{weight}'")
+        )
+
+    return (
+        weighted(title, "A")
+        .op("||")(weighted(code, "A"))
+        .op("||")(weighted(category, "B"))
+        .op("||")(weighted(description, "C"))
+    )
+
+
 # Junction table for course prerequisites
 course_prerequisites = Table(
     "course_prerequisites",
@@ -27,6 +51,23 @@ class Course(Base):
     difficulty_level = Column(String, nullable=True, default="Beginner")
     instructor_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     syllabus_url = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now(), nullable=False)
+    # Changes whenever the course's API representation does, including the counter
+    # columns below (onupdate also applies to their Core UPDATEs); drives ETags
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow,
+                        server_default=func.now(), nullable=False, index=True)
+    
+    # Denormalized seat counters, kept in step by the Enrollment/WaitlistEntry
+    # insert and delete listeners so capacity checks never need a COUNT(*)
+    enrolled_count = Column(Integer, default=0, server_default="0", nullable=False)
+    waitlist_count = Column(Integer, default=0, server_default="0", nullable=False)
+    enrollment_count = synonym("enrolled_count")
+    
+    # Review aggregates, maintained by the Review listeners; average_rating is
+    # stored (not computed per query) so min_rating filters can use its index
+    rating_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    rating_count = Column(Integer, default=0, server_default="0", nullable=False)
+    average_rating = Column(Float, nullable=True, index=True)
     
     # Relationships
     enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
@@ -39,4 +80,68 @@ class Course(Base):
         primaryjoin=id == course_prerequisites.c.course_id,
         secondaryjoin=id == course_prerequisites.c.prerequisite_id,
         backref="required_for"
-    )
\ No newline at end of file
+    )
+    
+    __table_args__ = (
+        # Keyset pagination of the catalog
+        Index("ix_courses_created_at_id", "created_at", "id"),
+        Index(
+            "ix_courses_search_document",
+            search_document(title, code, category, description),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# Full-text search on SQLite (tests/local): an FTS5 external-content table kept in step by triggers.
+# The update trigger only fires for the indexed columns, so seat counter and
+# rating updates do not touch the search index.
+SQLITE_FTS_TABLE = "courses_fts"
+_FTS_COLUMNS = "title, code, category, description"
+_sqlite_search_ddl = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    f"{_FTS_COLUMNS}, content='courses', content_rowid='rowid')",
+    f"CREATE TRIGGER IF NOT EXISTS courses_fts_ai AFTER INSERT ON courses BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLUMNS}) "
+    f"VALUES (new.rowid, new.title, new.code, new.category, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS courses_fts_ad AFTER DELETE ON courses BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, old.title, old.code, old.category, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS courses_fts_au AFTER UPDATE OF {_FTS_COLUMNS} ON courses BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, {_FTS_COLUMNS}) "
+    f"VALUES ('delete', old.rowid, old.title, old.code, old.category, old.description); "
+    f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, {_FTS_COLUMNS}) "
+    f"VALUES (new.rowid, new.title, new.code, new.category, new.description); END",
+]
+for _statement in _sqlite_search_ddl:
+    event.listen(Course.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Course.__table__, "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}").execute_if(dialect="sqlite")
+)
+
+
+def adjust_course_counter(connection, course_id, column: str, delta: int):
+    """Atomically shift a seat counter on the course row inside the current transaction."""
+    counter = Course.__table__.c[column]
+    connection.execute(
+        update(Course.__table__)
+        .where(Course.__table__.c.id == course_id)
+        .values({column: counter + delta})
+    )
+
+
+def adjust_course_rating(connection, course_id, rating_delta: int, count_delta: int):
+    """Shift the rating aggregates and recompute the average in one UPDATE."""
+    table = Course.__table__
+    new_sum = table.c.rating_sum + rating_delta
+    new_count = table.c.rating_count + count_delta
+    connection.execute(
+        update(table)
+        .where(table.c.id == course_id)
+        .values(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            average_rating=case((new_count > 0, new_sum * 1.0 / new_count), else_=None),
+        )
+    )
@@ -1,8 +1,9 @@
 import enum
-from sqlalchemy import Column, DateTime, ForeignKey, String, Enum
+from sqlalchemy import Column, DateTime, ForeignKey, String, Enum, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from app.models.course import adjust_course_counter
 from datetime import datetime
 import uuid
 
@@ -16,6 +17,14 @@ class EnrollmentStatus(str, enum.Enum):
 class Enrollment(Base):
     
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # One enrollment per student per course; the leading user_id also serves get_by_user
+        Index("ix_enrollments_user_id_course_id", "user_id", "course_id", unique=True),
+        # Per-course listings and counts, in creation order
+        Index("ix_enrollments_course_id_created_at", "course_id", "created_at"),
+        # Keyset pagination over all enrollments (admin listings and exports)
+        Index("ix_enrollments_created_at_id", "created_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -27,4 +36,20 @@ class Enrollment(Base):
     # Relationships
     user = relationship("User", back_populates="enrollments")
     course = relationship("Course", back_populates="enrollments")
-    review = relationship("Review", back_populates="enrollment", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
+    review = relationship("Review", back_populates="enrollment", uselist=False, cascade="all, delete-orphan")
+    
+    # Set (not persisted) when the seat was already claimed by course_crud.reserve_seat,
+    # so the insert listener must not count it a second time
+    seat_reserved = False
+
+
+@event.listens_for(Enrollment, "after_insert")
+def _increment_enrolled_count(mapper, connection, target):
+    if target.seat_reserved:
+        return
+    adjust_course_counter(connection, target.course_id, "enrolled_count", 1)
+
+
+@event.listens_for(Enrollment, "after_delete")
+def _decrement_enrolled_count(mapper, connection, target):
+    adjust_course_counter(connection, target.course_id, "enrolled_count", -1)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from datetime import datetime
 import uuid
 
 
@@ -15,6 +16,7 @@ class Lesson(Base):
     order = Column(Integer, default=0)
     module_id = Column(UUID(as_uuid=True), ForeignKey("modules.id"), nullable=False)
     resource_url = Column(String, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     module = relationship("Module", back_populates="lessons")
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from datetime import datetime
 import uuid
 
 
@@ -12,6 +13,7 @@ class Module(Base):
     title = Column(String, nullable=False)
     order = Column(Integer, default=0)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id"), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now(), nullable=False)
     
     # Relationships
     course = relationship("Course", back_populates="modules")
@@ -0,0 +1,47 @@
+import enum
+from sqlalchemy import Column, DateTime, Integer, String, Enum, Index, JSON
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+from datetime import datetime
+import uuid
+
+
+class NotificationKind(str, enum.Enum):
+    ENROLLMENT = "enrollment"
+    WAITLIST_JOINED = "waitlist_joined"
+    WAITLIST_PROMOTION = "waitlist_promotion"
+    WELCOME = "welcome"
+    LOGIN = "login"
+
+
+class NotificationStatus(str, enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    DEAD = "dead"  # gave up after NOTIFICATION_MAX_ATTEMPTS; see `python -m app.manage requeue-notifications`
+
+
+class Notification(Base):
+    """
+    Outbox row for one outbound notification.
+
+    Written in the same transaction as the change it announces, so a notification
+    exists if and only if that change committed. Delivered by `python -m app.worker`.
+    """
+    
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # The worker's poll: pending rows whose next attempt is due, oldest first
+        Index("ix_notifications_status_available_at", "status", "available_at"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    kind = Column(Enum(NotificationKind), nullable=False)
+    recipient = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(NotificationStatus), nullable=False, default=NotificationStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Not before this time: the next retry, or the end of a worker's lease on the row
+    available_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
@@ -1,13 +1,19 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Index, event
+from sqlalchemy.orm.attributes import get_history
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from app.models.course import adjust_course_rating
 from datetime import datetime
 import uuid
 
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        Index("ix_reviews_course_id_created_at", "course_id", "created_at"),
+        Index("ix_reviews_user_id", "user_id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -21,3 +27,20 @@ class Review(Base):
     user = relationship("User", backref="reviews")
     course = relationship("Course", backref="reviews")
     enrollment = relationship("Enrollment", back_populates="review")
+
+
+@event.listens_for(Review, "after_insert")
+def _add_rating(mapper, connection, target):
+    adjust_course_rating(connection, target.course_id, target.rating, 1)
+
+
+@event.listens_for(Review, "after_delete")
+def _remove_rating(mapper, connection, target):
+    adjust_course_rating(connection, target.course_id, -target.rating, -1)
+
+
+@event.listens_for(Review, "after_update")
+def _change_rating(mapper, connection, target):
+    history = get_history(target, "rating")
+    if history.deleted and history.added:
+        adjust_course_rating(connection, target.course_id, history.added[0] - history.deleted[0], 0)
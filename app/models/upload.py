@@ -0,0 +1,92 @@
+import enum
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Index, Enum, update, event
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from app.database import Base
+from datetime import datetime
+import uuid
+
+
+class StoredFile(Base):
+    """
+    One copy of some uploaded content, addressed by its SHA-256.
+    ref_count is the number of Upload rows pointing at it: upload_crud.create_async takes
+    the reference, the listener below releases it.
+    """
+    __tablename__ = "stored_files"
+    
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String, nullable=False)  # relative to UPLOAD_DIR
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Upload(Base):
+    """One user's upload; identical uploads share a StoredFile."""
+    __tablename__ = "uploads"
+    __table_args__ = (
+        Index("ix_uploads_sha256", "sha256"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    sha256 = Column(String(64), ForeignKey("stored_files.sha256"), nullable=False)
+    filename = Column(String, nullable=True)
+    content_type = Column(String, nullable=True)
+    uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Relationships
+    stored_file = relationship("StoredFile")
+
+
+class UploadSessionStatus(str, enum.Enum):
+    OPEN = "open"
+    COMPLETING = "completing"
+
+
+class UploadSession(Base):
+    """
+    A resumable upload in progress. Chunks live on disk under UPLOAD_STAGING_DIR/sessions/<id>;
+    completing the session turns them into an Upload. Sessions idle for longer than
+    UPLOAD_SESSION_TTL_SECONDS are removed by `python -m app.manage gc-uploads`.
+    """
+    __tablename__ = "upload_sessions"
+    __table_args__ = (
+        # Garbage collection looks for idle sessions
+        Index("ix_upload_sessions_updated_at", "updated_at"),
+    )
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    filename = Column(String, nullable=False)
+    content_type = Column(String, nullable=True)
+    size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    status = Column(Enum(UploadSessionStatus), nullable=False, default=UploadSessionStatus.OPEN)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Last activity: creation or the latest chunk
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    @property
+    def chunk_count(self) -> int:
+        return -(-self.size // self.chunk_size)
+    
+    def chunk_length(self, index: int) -> int:
+        """Expected byte length of a chunk: chunk_size, except for a shorter last one."""
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+
+def adjust_ref_count(connection, sha256: str, delta: int):
+    """Atomically shift a stored file's reference count inside the current transaction."""
+    table = StoredFile.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.sha256 == sha256)
+        .values(ref_count=table.c.ref_count + delta)
+    )
+
+
+@event.listens_for(Upload, "after_delete")
+def _decrement_ref_count(mapper, connection, target):
+    adjust_ref_count(connection, target.sha256, -1)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.database import Base
+from app.models.course import adjust_course_counter
 from datetime import datetime
 import uuid
 
@@ -9,6 +10,11 @@ import uuid
 class WaitlistEntry(Base):
     
     __tablename__ = "waitlist_entries"
+    __table_args__ = (
+        Index("ix_waitlist_entries_user_id_course_id", "user_id", "course_id", unique=True),
+        # Promotion walks the queue with ORDER BY created_at
+        Index("ix_waitlist_entries_course_id_created_at", "course_id", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
@@ -18,3 +24,14 @@ class WaitlistEntry(Base):
     # Relationships
     user = relationship("User")
     course = relationship("Course", back_populates="waitlist_entries")
+
+
+
+@event.listens_for(WaitlistEntry, "after_insert")
+def _increment_waitlist_count(mapper, connection, target):
+    adjust_course_counter(connection, target.course_id, "waitlist_count", 1)
+
+
+@event.listens_for(WaitlistEntry, "after_delete")
+def _decrement_waitlist_count(mapper, connection, target):
+    adjust_course_counter(connection, target.course_id, "waitlist_count", -1)
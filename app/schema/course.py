@@ -36,6 +36,8 @@ class CourseResponse(CourseBase):
     instructor_id: Optional[uuid.UUID] = None
     enrollment_count: int = 0
     waitlist_count: int = 0
+    average_rating: Optional[float] = None
+    rating_count: int = 0
     
     model_config = ConfigDict(from_attributes=True)
 
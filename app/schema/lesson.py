@@ -28,3 +28,15 @@ class LessonResponse(LessonBase):
     module_id: uuid.UUID
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class LessonOutline(BaseModel):
+    """Lesson without its content body, for course outlines."""
+    id: uuid.UUID
+    module_id: uuid.UUID
+    title: str
+    content_type: str
+    order: int = 0
+    resource_url: Optional[str] = None
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -29,4 +29,10 @@ class ModuleWithLessons(ModuleResponse):
     
     model_config = ConfigDict(from_attributes=True)
 
-from app.schema.lesson import LessonResponse
+
+class ModuleOutline(ModuleResponse):
+    lessons: List["LessonOutline"] = []
+    
+    model_config = ConfigDict(from_attributes=True)
+
+from app.schema.lesson import LessonResponse, LessonOutline
@@ -0,0 +1,32 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import List, Optional, Tuple
+import uuid
+
+
+class UploadResponse(BaseModel):
+    id: uuid.UUID
+    url: str
+    sha256: str
+    size: int
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(..., min_length=1)
+    size: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+    # Defaults to UPLOAD_SESSION_CHUNK_SIZE
+    chunk_size: Optional[int] = Field(None, ge=64 * 1024)
+
+
+class UploadSessionResponse(BaseModel):
+    id: uuid.UUID
+    filename: str
+    size: int
+    chunk_size: int
+    chunk_count: int
+    # Received chunks as inclusive [first, last] index ranges
+    received: List[Tuple[int, int]] = []
+    expires_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
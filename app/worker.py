@@ -0,0 +1,130 @@
+"""
+Notification outbox worker.
+
+Usage:
+    python -m app.worker [--once]
+
+Delivers the notifications request handlers queue in the notifications table.
+Run it as its own process next to the web workers; several can run at once.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.config import settings
+from app.core.logging_config import setup_logging
+from app.core.notifier import Event, NotificationDispatcher
+from app.crud.notification import notification_crud
+from app.database import SessionLocal
+import app.models  # noqa: F401  (register all mappers)
+
+logger = logging.getLogger("app")
+
+
+class NotificationWorker:
+    """
+    Drain the outbox in batches: lease due rows, hand them to the dispatcher, record
+    the outcome. A batch closes when it reaches batch_size or when the poll finds
+    fewer due rows, so under load batches fill up and otherwise nothing waits longer
+    than the poll interval. Delivery is at-least-once - a worker that dies mid-batch
+    leaves its rows leased, and they are retried once the lease runs out.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        dispatcher: Optional[NotificationDispatcher] = None,
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE,
+        max_attempts: int = settings.NOTIFICATION_MAX_ATTEMPTS,
+        retry_base_seconds: float = settings.NOTIFICATION_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = settings.NOTIFICATION_RETRY_MAX_SECONDS,
+        lease_seconds: float = settings.NOTIFICATION_LEASE_SECONDS,
+    ):
+        self.session_factory = session_factory
+        self.dispatcher = dispatcher or NotificationDispatcher()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.lease_seconds = lease_seconds
+
+    def retry_delay(self, attempts: int) -> timedelta:
+        """Exponential backoff after the given number of failed attempts, capped."""
+        seconds = min(self.retry_base_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        return timedelta(seconds=seconds)
+
+    async def run_once(self) -> int:
+        """Process one batch; returns the number of notifications attempted."""
+        db = self.session_factory()
+        try:
+            claimed = notification_crud.claim_batch(db, batch_size=self.batch_size, lease_seconds=self.lease_seconds)
+            # Plain values: the rows are not touched again until the results are recorded
+            batch = [(Event(n.id, n.kind, n.recipient, n.payload), n.attempts) for n in claimed]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        if not batch:
+            return 0
+
+        outcomes = await self.dispatcher.dispatch([event for event, _ in batch])
+
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            notification_crud.mark_sent(db, [event.id for event, _ in batch if outcomes[event.id] is None], now=now)
+            for event, attempts in batch:
+                error = outcomes[event.id]
+                if error is None:
+                    continue
+                retry_at = now + self.retry_delay(attempts) if attempts < self.max_attempts else None
+                notification_crud.mark_failed(db, event.id, error=repr(error), retry_at=retry_at)
+                if retry_at is None:
+                    logger.error(f"Dead-lettered {event.kind.value} notification {event.id} for {event.recipient}: {error!r}")
+                else:
+                    logger.warning(f"{event.kind.value} notification {event.id} failed (attempt {attempts}), retrying at {retry_at}: {error!r}")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        return len(batch)
+
+    async def run(self, poll_interval: float = settings.NOTIFICATION_POLL_INTERVAL_SECONDS):
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Notification batch failed")
+                processed = 0
+            # A full batch suggests more is waiting; otherwise wait for new rows
+            if processed < self.batch_size:
+                await asyncio.sleep(poll_interval)
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.worker")
+    parser.add_argument("--once", action="store_true", help="Process a single batch and exit")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    worker = NotificationWorker()
+    if args.once:
+        processed = asyncio.run(worker.run_once())
+        print(f"Processed {processed} notification(s)")
+        return 0
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Query plans and timings for the enrollment, waitlist and review hot lookups,
+before and after the composite indexes (alembic revision 5c9c2207e9fe).
+
+Usage:
+    python -m benchmarks.bench_enrollment_indexes [--url URL] [--enrollments 1000000]
+
+Point --url at an EMPTY scratch database; the tables are created and dropped
+by the script. Defaults to a throwaway SQLite file. Use a PostgreSQL URL to see
+the production planner (EXPLAIN ANALYZE instead of EXPLAIN QUERY PLAN).
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text, bindparam, inspect
+
+from app.database import Base
+from app.models.user import User
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.review import Review
+import app.models  # noqa: F401
+
+
+INDEXED_TABLES = [Enrollment.__table__, WaitlistEntry.__table__, Review.__table__]
+
+# Indexes added by revision 5c9c2207e9fe
+BENCHMARKED_INDEXES = {
+    "ix_enrollments_user_id_course_id",
+    "ix_enrollments_course_id_created_at",
+    "ix_waitlist_entries_user_id_course_id",
+    "ix_waitlist_entries_course_id_created_at",
+    "ix_reviews_course_id_created_at",
+    "ix_reviews_user_id",
+}
+
+UUID_TYPE = Enrollment.__table__.c.user_id.type
+
+QUERIES = {
+    "enrollment_crud.get_by_user_and_course": (
+        "SELECT * FROM enrollments WHERE user_id = :user_id AND course_id = :course_id",
+        ("user_id", "course_id"),
+    ),
+    "enrollment_crud.get_by_user": (
+        "SELECT * FROM enrollments WHERE user_id = :user_id",
+        ("user_id",),
+    ),
+    "enrollment_crud.get_by_course": (
+        "SELECT * FROM enrollments WHERE course_id = :course_id LIMIT 100",
+        ("course_id",),
+    ),
+    "waitlist_crud.count_by_course": (
+        "SELECT count(*) FROM waitlist_entries WHERE course_id = :course_id",
+        ("course_id",),
+    ),
+    "waitlist_crud.get_by_course": (
+        "SELECT * FROM waitlist_entries WHERE course_id = :course_id ORDER BY created_at ASC",
+        ("course_id",),
+    ),
+    "review_crud.get_by_course": (
+        "SELECT * FROM reviews WHERE course_id = :course_id LIMIT 100",
+        ("course_id",),
+    ),
+}
+
+
+def composite_indexes():
+    return [index for table in INDEXED_TABLES for index in table.indexes if index.name in BENCHMARKED_INDEXES]
+
+
+def seed(engine, n_enrollments: int, n_courses: int, per_user: int, chunk: int = 20_000):
+    n_users = max(1, n_enrollments // per_user)
+    course_ids = [uuid.uuid4() for _ in range(n_courses)]
+    user_ids = [uuid.uuid4() for _ in range(n_users)]
+    start = datetime(2026, 1, 1)
+
+    def batched(rows_iter, table):
+        batch = []
+        with engine.begin() as conn:
+            for row in rows_iter:
+                batch.append(row)
+                if len(batch) >= chunk:
+                    conn.execute(table.insert(), batch)
+                    batch = []
+            if batch:
+                conn.execute(table.insert(), batch)
+
+    batched(
+        ({"id": cid, "title": f"Course {i}", "code": f"BENCH{i}", "capacity": 10_000,
+          "is_active": True, "enrolled_count": 0, "waitlist_count": 0} for i, cid in enumerate(course_ids)),
+        Course.__table__,
+    )
+    batched(
+        ({"id": uid, "name": f"User {i}", "email": f"bench{i}@example.com", "hashed_password": "x",
+          "role": "STUDENT", "is_active": True} for i, uid in enumerate(user_ids)),
+        User.__table__,
+    )
+
+    enrollment_ids = []
+
+    def enrollments():
+        made = 0
+        for u, uid in enumerate(user_ids):
+            for j in range(per_user):
+                if made >= n_enrollments:
+                    return
+                eid = uuid.uuid4()
+                if made % 10 == 0:
+                    enrollment_ids.append((eid, uid, course_ids[(u * per_user + j) % n_courses]))
+                made += 1
+                yield {"id": eid, "user_id": uid, "course_id": course_ids[(u * per_user + j) % n_courses],
+                       "status": "ENROLLED", "created_at": start + timedelta(seconds=made)}
+
+    batched(enrollments(), Enrollment.__table__)
+
+    # Waitlist: each user queued for one course they are not enrolled in
+    batched(
+        ({"id": uuid.uuid4(), "user_id": uid, "course_id": course_ids[(u * per_user + per_user) % n_courses],
+          "created_at": start + timedelta(seconds=u)} for u, uid in enumerate(user_ids[: n_enrollments // 10])),
+        WaitlistEntry.__table__,
+    )
+    batched(
+        ({"id": uuid.uuid4(), "user_id": uid, "course_id": cid, "enrollment_id": eid,
+          "rating": 1 + i % 5, "created_at": start + timedelta(seconds=i)} for i, (eid, uid, cid) in enumerate(enrollment_ids)),
+        Review.__table__,
+    )
+    return user_ids, course_ids
+
+
+def explain(conn, sql: str, params: dict) -> str:
+    prefix = "EXPLAIN ANALYZE " if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    rows = conn.execute(bind(prefix + sql, params), params).fetchall()
+    return "\n".join("    " + " | ".join(str(col) for col in row) for row in rows)
+
+
+def bind(sql: str, params: dict):
+    return text(sql).bindparams(*(bindparam(name, type_=UUID_TYPE) for name in params))
+
+
+def run_queries(engine, user_ids, course_ids, repeats: int):
+    rng = random.Random(42)
+    results = {}
+    with engine.connect() as conn:
+        for label, (sql, names) in QUERIES.items():
+            u = rng.randrange(len(user_ids))
+            sample = {"user_id": user_ids[u], "course_id": course_ids[(u * 5) % len(course_ids)]}
+            params = {name: sample[name] for name in names}
+            plan = explain(conn, sql, params)
+
+            statement = bind(sql, params)
+            timings = []
+            for _ in range(repeats):
+                u = rng.randrange(len(user_ids))
+                sample = {"user_id": user_ids[u], "course_id": course_ids[rng.randrange(len(course_ids))]}
+                params = {name: sample[name] for name in names}
+                t0 = time.perf_counter()
+                conn.execute(statement, params).fetchall()
+                timings.append((time.perf_counter() - t0) * 1000)
+            results[label] = (plan, statistics.median(timings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_indexes.db")
+    parser.add_argument("--enrollments", type=int, default=1_000_000)
+    parser.add_argument("--courses", type=int, default=2_000)
+    parser.add_argument("--per-user", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if inspect(engine).has_table("users"):
+        raise SystemExit(f"{args.url} already has tables; point --url at an empty scratch database")
+
+    Base.metadata.create_all(engine)
+    try:
+        with engine.begin() as conn:
+            for index in composite_indexes():
+                index.drop(conn)
+
+        t0 = time.perf_counter()
+        user_ids, course_ids = seed(engine, args.enrollments, args.courses, args.per_user)
+        print(f"Seeded {args.enrollments:,} enrollments in {time.perf_counter() - t0:.1f}s ({engine.dialect.name})")
+
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        before = run_queries(engine, user_ids, course_ids, args.repeats)
+
+        with engine.begin() as conn:
+            for index in composite_indexes():
+                index.create(conn)
+            conn.execute(text("ANALYZE"))
+        after = run_queries(engine, user_ids, course_ids, args.repeats)
+
+        for label in QUERIES:
+            (plan_before, ms_before), (plan_after, ms_after) = before[label], after[label]
+            print(f"\n== {label}: {ms_before:.3f} ms -> {ms_after:.3f} ms (median of {args.repeats})")
+            print("  before:\n" + plan_before)
+            print("  after:\n" + plan_after)
+    finally:
+        Base.metadata.drop_all(engine)
+        if engine.dialect.name == "sqlite" and engine.url.database and os.path.exists(engine.url.database):
+            engine.dispose()
+            os.remove(engine.url.database)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Notification throughput: one task and connection per event vs. the batching dispatcher.
+
+Simulates a registration rush of --events notifications spread over --recipients
+addresses, delivered through a stand-in provider that charges --connect-ms per
+connection and --send-ms per message and accepts at most --connections at once.
+  * per-event  - every event is its own task opening its own connection, as the
+                 old BackgroundTasks senders did
+  * dispatcher - NotificationDispatcher over batches of --batch-size, as the outbox
+                 worker runs it, with --workers workers draining concurrently
+
+Usage:
+    python -m benchmarks.bench_notification_dispatch [--events 2000] [--recipients 1500] [--batch-size 50] [--workers 4]
+
+No database is needed; only the delivery path is measured.
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from app.core.notifier import Event, NotificationDispatcher, compose
+from app.models.notification import NotificationKind
+
+
+class SimulatedProvider:
+    """Email provider stand-in with per-connection and per-message latency."""
+
+    def __init__(self, connect_ms: float, send_ms: float, max_connections: int):
+        self.connect_s = connect_ms / 1000
+        self.send_s = send_ms / 1000
+        self.slots = asyncio.Semaphore(max_connections)
+        self.connections = 0
+        self.messages = 0
+
+    def __call__(self):
+        return SimulatedConnection(self)
+
+
+class SimulatedConnection:
+
+    def __init__(self, provider: SimulatedProvider):
+        self.provider = provider
+
+    async def __aenter__(self):
+        await self.provider.slots.acquire()
+        self.provider.connections += 1
+        await asyncio.sleep(self.provider.connect_s)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.provider.slots.release()
+
+    async def send(self, message):
+        await asyncio.sleep(self.provider.send_s)
+        self.provider.messages += 1
+
+
+def make_events(n_events: int, n_recipients: int, seed: int = 42):
+    rng = random.Random(seed)
+    recipients = [f"student{i}@example.com" for i in range(n_recipients)]
+    events = []
+    for _ in range(n_events):
+        recipient = rng.choice(recipients)
+        if rng.random() < 0.3:
+            events.append(Event(uuid.uuid4(), NotificationKind.LOGIN, recipient, {"ip_address": "203.0.113.7"}))
+        else:
+            events.append(Event(uuid.uuid4(), NotificationKind.ENROLLMENT, recipient, {"course_title": "Algebra I"}))
+    return events
+
+
+async def per_event(events, provider: SimulatedProvider):
+    async def send_one(event):
+        async with provider() as connection:
+            await connection.send(compose(event.recipient, [event]))
+
+    await asyncio.gather(*(send_one(event) for event in events))
+
+
+async def batched(events, provider: SimulatedProvider, batch_size: int, workers: int):
+    batches = asyncio.Queue()
+    for i in range(0, len(events), batch_size):
+        batches.put_nowait(events[i:i + batch_size])
+    dispatcher = NotificationDispatcher(provider)
+
+    async def worker():
+        while not batches.empty():
+            await dispatcher.dispatch(batches.get_nowait())
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+def report(name: str, n_events: int, elapsed: float, provider: SimulatedProvider):
+    print(
+        f"{name:<11} {n_events / elapsed:10.1f} events/s   {elapsed:7.2f} s   "
+        f"{provider.connections:6d} connections   {provider.messages:6d} messages"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--recipients", type=int, default=1500)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--connect-ms", type=float, default=50)
+    parser.add_argument("--send-ms", type=float, default=2)
+    parser.add_argument("--connections", type=int, default=10, help="Provider's concurrent connection limit")
+    args = parser.parse_args()
+
+    events = make_events(args.events, args.recipients)
+    print(
+        f"{args.events} events for {len({e.recipient for e in events})} recipients; "
+        f"connect {args.connect_ms} ms, send {args.send_ms} ms, {args.connections} connections max"
+    )
+
+    provider = SimulatedProvider(args.connect_ms, args.send_ms, args.connections)
+    t0 = time.perf_counter()
+    asyncio.run(per_event(events, provider))
+    report("per-event", args.events, time.perf_counter() - t0, provider)
+
+    provider = SimulatedProvider(args.connect_ms, args.send_ms, args.connections)
+    t0 = time.perf_counter()
+    asyncio.run(batched(events, provider, args.batch_size, args.workers))
+    report("dispatcher", args.events, time.perf_counter() - t0, provider)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Course outline latency: database load + serialization vs. outline cache hits.
+
+Seeds one course with --modules modules of --lessons lessons each, then times:
+  * miss   - module_crud.get_outline_async + JSON encoding (what a cold request pays)
+  * local  - outline_cache hit from the in-process LRU tier
+  * redis  - hit from the Redis tier with an empty local tier (only with --redis)
+
+Usage:
+    python -m benchmarks.bench_outline_cache [--url URL] [--modules 40] [--lessons 8] [--redis redis://localhost:6379/15]
+
+Point --url at an EMPTY scratch database; the tables are created and dropped
+by the script. Defaults to a throwaway SQLite file. --redis should name a
+scratch Redis database: the benchmark writes outline:* keys to it.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base, to_async_url
+from app.models.course import Course
+from app.models.module import Module
+from app.models.lesson import Lesson
+from app.crud.module import module_crud
+from app.core.outline_cache import OutlineCache
+from app.schema.module import ModuleWithLessons
+import app.models  # noqa: F401
+
+
+def seed(engine, n_modules: int, n_lessons: int, content_bytes: int) -> uuid.UUID:
+    course_id = uuid.uuid4()
+    module_ids = [uuid.uuid4() for _ in range(n_modules)]
+    with engine.begin() as conn:
+        conn.execute(Course.__table__.insert(), [{
+            "id": course_id, "title": "Benchmark Course", "code": "OUTLINE1", "capacity": 100,
+            "is_active": True, "enrolled_count": 0, "waitlist_count": 0,
+        }])
+        conn.execute(Module.__table__.insert(), [
+            {"id": mid, "title": f"Module {m}", "order": m, "course_id": course_id}
+            for m, mid in enumerate(module_ids)
+        ])
+        conn.execute(Lesson.__table__.insert(), [
+            {"id": uuid.uuid4(), "title": f"Lesson {m}.{l}", "content_type": "text",
+             "content_data": "x" * content_bytes, "order": l, "module_id": mid}
+            for m, mid in enumerate(module_ids) for l in range(n_lessons)
+        ])
+    return course_id
+
+
+def summarize(timings: List[float]) -> str:
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return f"p50 {statistics.median(timings):8.3f} ms   p99 {p99:8.3f} ms"
+
+
+async def bench(async_url, course_id, repeats: int, redis_url):
+    engine = create_async_engine(async_url)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    encoder = TypeAdapter(List[ModuleWithLessons])
+    results = {}
+
+    async def load() -> bytes:
+        async with Session() as db:
+            modules = await module_crud.get_outline_async(db, course_id=course_id, include_content=True)
+            return encoder.dump_json(modules)
+
+    body = await load()  # warm the connection pool
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        await load()
+        timings.append((time.perf_counter() - t0) * 1000)
+    results["miss (db + encode)"] = timings
+
+    cache = OutlineCache(maxsize=1000, ttl=300)
+    version = await cache.current_version(course_id)
+    await cache.set(course_id, version, "full", body)
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        assert await cache.get(course_id, await cache.current_version(course_id), "full") is not None
+        timings.append((time.perf_counter() - t0) * 1000)
+    results["hit (local LRU)"] = timings
+
+    if redis_url:
+        cache = OutlineCache(maxsize=1000, ttl=300, redis_url=redis_url)
+        version = await cache.current_version(course_id)
+        await cache.set(course_id, version, "full", body)
+        timings = []
+        for _ in range(repeats):
+            cache.local.clear()
+            t0 = time.perf_counter()
+            assert await cache.get(course_id, await cache.current_version(course_id), "full") is not None
+            timings.append((time.perf_counter() - t0) * 1000)
+        results["hit (redis)"] = timings
+
+    await engine.dispose()
+    return results, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite:///./bench_outline.db")
+    parser.add_argument("--modules", type=int, default=40)
+    parser.add_argument("--lessons", type=int, default=8)
+    parser.add_argument("--content-bytes", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--redis", default=None, help="Redis URL to also time the shared tier")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    if inspect(engine).has_table("courses"):
+        raise SystemExit(f"{args.url} already has tables; point --url at an empty scratch database")
+
+    Base.metadata.create_all(engine)
+    try:
+        course_id = seed(engine, args.modules, args.lessons, args.content_bytes)
+        results, size = asyncio.run(bench(to_async_url(args.url), course_id, args.repeats, args.redis))
+        print(f"Outline: {args.modules} modules x {args.lessons} lessons, {size:,} bytes of JSON ({engine.dialect.name})")
+        for label, timings in results.items():
+            print(f"  {label:<20} {summarize(timings)}")
+    finally:
+        Base.metadata.drop_all(engine)
+        if engine.dialect.name == "sqlite" and engine.url.database and os.path.exists(engine.url.database):
+            engine.dispose()
+            os.remove(engine.url.database)
+
+
+if __name__ == "__main__":
+    main()
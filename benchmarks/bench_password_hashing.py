@@ -0,0 +1,77 @@
+"""
+Login throughput for each password hashing scheme.
+
+Simulates a login storm: --logins concurrent verify calls pushed through the
+bounded hashing pool (app.core.password_pool) for a bcrypt hash and an argon2id
+hash built with the current Settings, and reports logins/second plus p50/p99
+latency. Tune BCRYPT_ROUNDS / ARGON2_* in the environment to compare costs.
+
+Usage:
+    python -m benchmarks.bench_password_hashing [--logins 200] [--concurrency 32]
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import settings
+from app.core.hashers import HASHERS
+from app.core.password_pool import PasswordHashingPool, PasswordPoolSaturated
+
+
+PASSWORD = "correct horse battery staple"
+
+
+def bench_scheme(scheme: str, logins: int, concurrency: int, workers: int, use_processes: bool):
+    hasher = HASHERS[scheme]
+    hashed = hasher.hash(PASSWORD)
+    # No queue limit here: we want throughput, not rejection behaviour
+    pool = PasswordHashingPool(max_workers=workers, max_queue=logins, use_processes=use_processes)
+    pool.run(hasher.verify, PASSWORD, hashed)  # warm the executor
+
+    def login(_):
+        t0 = time.perf_counter()
+        try:
+            assert pool.run(hasher.verify, PASSWORD, hashed)
+        except PasswordPoolSaturated:
+            return None
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        latencies = [ms for ms in clients.map(login, range(logins)) if ms is not None]
+    elapsed = time.perf_counter() - t0
+    pool.shutdown()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return {
+        "logins_per_sec": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": p99,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32, help="simultaneous login requests")
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--processes", action="store_true", help="use a process pool instead of threads")
+    args = parser.parse_args()
+
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS} | argon2id t={settings.ARGON2_TIME_COST} "
+        f"m={settings.ARGON2_MEMORY_COST}KiB p={settings.ARGON2_PARALLELISM} | "
+        f"{args.workers} {'process' if args.processes else 'thread'} workers, {args.concurrency} concurrent logins"
+    )
+    for scheme in ("bcrypt", "argon2"):
+        result = bench_scheme(scheme, args.logins, args.concurrency, args.workers, args.processes)
+        print(
+            f"{scheme:>7}: {result['logins_per_sec']:8.1f} logins/s  "
+            f"p50 {result['p50_ms']:8.1f} ms  p99 {result['p99_ms']:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
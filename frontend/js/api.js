@@ -156,6 +156,11 @@ class API {
         return this.request(`/content/courses/${courseId}/modules`);
     }
 
+    // Modules and lessons without lesson bodies; fetch a body with getLesson
+    async getCourseOutline(courseId) {
+        return this.request(`/content/courses/${courseId}/outline`);
+    }
+
     async createModule(moduleData) {
         return this.request('/content/modules', {
             method: 'POST',
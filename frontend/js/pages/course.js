@@ -84,7 +84,7 @@ window.Init.course = async (courseId) => {
         // Load course details and content in parallel
         const [course, modules] = await Promise.all([
             api.getCourse(courseId),
-            api.getCourseModules(courseId)
+            api.getCourseOutline(courseId)
         ]);
 
         // Render course header
@@ -136,7 +136,7 @@ window.Init.course = async (courseId) => {
                         ${module.lessons && module.lessons.length > 0
                             ? module.lessons.map((lesson, lIdx) => `
                                 <li>
-                                    <button class="lesson-btn" data-lesson-id="${lesson.id}" data-lesson-title="${lesson.title}" data-content-type="${lesson.content_type}" data-content="${encodeURIComponent(lesson.content_data || '')}"
+                                    <button class="lesson-btn" data-lesson-id="${lesson.id}" data-lesson-title="${lesson.title}" data-content-type="${lesson.content_type}"
                                         style="width: 100%; text-align: left; background: none; border: none; cursor: pointer; padding: 0.6rem 0.5rem; border-radius: 8px; color: var(--text-muted); display: flex; align-items: center; gap: 0.6rem; transition: all 0.2s; font-size: 0.9rem;">
                                         <i class="fas fa-${lesson.content_type === 'video' ? 'play-circle' : lesson.content_type === 'file' ? 'file-download' : 'file-alt'}" style="color: var(--primary); width: 16px; flex-shrink: 0;"></i>
                                         <span>${lIdx + 1}. ${lesson.title}</span>
@@ -155,7 +155,7 @@ window.Init.course = async (courseId) => {
 
         // Lesson button interaction
         document.querySelectorAll('.lesson-btn').forEach(btn => {
-            btn.addEventListener('click', (e) => {
+            btn.addEventListener('click', async (e) => {
                 // Highlight active lesson
                 document.querySelectorAll('.lesson-btn').forEach(b => {
                     b.style.background = 'none';
@@ -167,8 +167,13 @@ window.Init.course = async (courseId) => {
                 // Render lesson content
                 const title = btn.getAttribute('data-lesson-title');
                 const type = btn.getAttribute('data-content-type');
-                const content = decodeURIComponent(btn.getAttribute('data-content'));
-                renderLesson(title, type, content);
+                try {
+                    // The outline carries no lesson bodies; load this one on demand
+                    const lesson = await api.getLesson(btn.getAttribute('data-lesson-id'));
+                    renderLesson(title, type, lesson.content_data || '');
+                } catch (err) {
+                    window.showToast(err.message, 'error');
+                }
             });
         });
         
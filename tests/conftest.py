@@ -2,14 +2,22 @@ import pytest
 import os
 
 os.environ["TESTING"] = "true"
+# Minimum bcrypt cost keeps the suite fast; production uses the Settings default
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
 
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db
 from app.models.user import User, UserRole
 from app.core.security import get_password_hash
+from app.core.catalog_cache import catalog_cache
 
 # Test database URL (separate from main database)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -22,6 +30,13 @@ engine = create_engine(
 # Create session for tests
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same file for the async endpoints.
+# NullPool: each TestClient runs its own event loop, so connections must not be reused across tests
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///./test.db", poolclass=NullPool
+)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 
 @pytest.fixture(scope="function")
 def db():
@@ -37,6 +52,8 @@ def db():
         database.close()
         # Drop all tables after test
         Base.metadata.drop_all(bind=engine)
+        # Cached catalog pages would outlive the rows they were built from
+        catalog_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -47,8 +64,13 @@ def client(db):
         finally:
             pass
     
-    # Override the database dependency
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as session:
+            yield session
+    
+    # Override the database dependencies
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     
     # Create test client
     with TestClient(app) as test_client:
@@ -136,4 +158,26 @@ def instructor_token(client, test_instructor):
             "password": "password123"
         }
     )
-    return response.json()["access_token"]
\ No newline at end of file
+    return response.json()["access_token"]
+
+
+@pytest.fixture(scope="function")
+def no_lazy_loads():
+    """
+    Fail the test if any relationship is lazy-loaded while it runs (typically during
+    response serialization). Eager loaders (joinedload/selectinload) are not counted.
+    """
+    lazy_loads = []
+    
+    def record_lazy_load(orm_execute_state):
+        if orm_execute_state.lazy_loaded_from is not None:
+            mapper = orm_execute_state.bind_mapper
+            lazy_loads.append(f"{type(orm_execute_state.lazy_loaded_from.obj()).__name__} -> {mapper.class_.__name__ if mapper else '?'}")
+    
+    event.listen(Session, "do_orm_execute", record_lazy_load)
+    try:
+        yield lazy_loads
+    finally:
+        event.remove(Session, "do_orm_execute", record_lazy_load)
+    assert not lazy_loads, f"Unexpected lazy loads: {lazy_loads}"
+
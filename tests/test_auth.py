@@ -87,3 +87,148 @@ def test_login_inactive_user(client, db, test_student):
     )
 
     assert response.status_code in (401, 403)
+
+
+def test_decode_access_token_uses_cache():
+    from app.core.security import create_access_token, decode_access_token, token_cache
+    
+    token = create_access_token({"sub": "cached-user"})
+    assert decode_access_token(token)["sub"] == "cached-user"
+    hits_before = token_cache.hits
+    
+    assert decode_access_token(token)["sub"] == "cached-user"
+    assert token_cache.hits == hits_before + 1
+
+
+def test_cached_token_expires_with_token():
+    import time
+    from datetime import timedelta
+    from app.core.security import create_access_token, decode_access_token
+    
+    token = create_access_token({"sub": "short-lived"}, expires_delta=timedelta(seconds=1))
+    assert decode_access_token(token) is not None
+    
+    # exp has whole-second granularity
+    time.sleep(2)
+    assert decode_access_token(token) is None
+
+
+def test_cached_token_rejected_after_secret_rotation(monkeypatch):
+    from app.config import settings
+    from app.core.security import create_access_token, decode_access_token
+    
+    token = create_access_token({"sub": "rotated"})
+    assert decode_access_token(token) is not None
+    
+    monkeypatch.setattr(settings, "SECRET_KEY", "a-brand-new-secret")
+    assert decode_access_token(token) is None
+
+
+def test_login_rejected_fast_when_hashing_pool_saturated(client, test_student, monkeypatch):
+    from app.core.password_pool import password_pool
+    
+    monkeypatch.setattr(password_pool, "in_flight", password_pool.max_workers + password_pool.max_queue)
+    
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "teststudent@test.com", "password": "password123"}
+    )
+    
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_hashing_pool_bounds_queue():
+    import threading
+    import pytest
+    from app.core.password_pool import PasswordHashingPool, PasswordPoolSaturated
+    
+    pool = PasswordHashingPool(max_workers=1, max_queue=0)
+    release = threading.Event()
+    started = threading.Event()
+    
+    def slow_hash():
+        started.set()
+        release.wait(5)
+        return "hashed"
+    
+    results = []
+    worker = threading.Thread(target=lambda: results.append(pool.run(slow_hash)))
+    worker.start()
+    started.wait(5)
+    
+    with pytest.raises(PasswordPoolSaturated):
+        pool.run(slow_hash)
+    
+    release.set()
+    worker.join(5)
+    assert results == ["hashed"]
+    assert pool.stats()["rejected"] == 1
+    pool.shutdown()
+
+
+def test_login_upgrades_legacy_bcrypt_hash(client, db):
+    import bcrypt
+    from app.models.user import User, UserRole
+    
+    legacy_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    user = User(
+        email="legacy@test.com",
+        name="Legacy User",
+        hashed_password=legacy_hash,
+        role=UserRole.STUDENT,
+        is_active=True
+    )
+    db.add(user)
+    db.commit()
+    
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@test.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    
+    db.refresh(user)
+    assert user.hashed_password.startswith("$argon2id$")
+    
+    # The upgraded hash still authenticates
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@test.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+
+
+def test_login_succeeds_when_rehash_hits_saturated_pool(client, db, monkeypatch):
+    import bcrypt
+    from app.core.password_pool import PasswordPoolSaturated, password_pool
+    from app.core.security import get_password_hash
+    from app.models.user import User, UserRole
+    
+    legacy_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode("utf-8")
+    user = User(
+        email="legacy@test.com",
+        name="Legacy User",
+        hashed_password=legacy_hash,
+        role=UserRole.STUDENT,
+        is_active=True
+    )
+    db.add(user)
+    db.commit()
+    
+    run = password_pool.run
+    def saturated_for_hashing(fn, *args):
+        if fn is get_password_hash:
+            raise PasswordPoolSaturated()
+        return run(fn, *args)
+    monkeypatch.setattr(password_pool, "run", saturated_for_hashing)
+    
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@test.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    
+    # The upgrade is simply left for a later login
+    db.refresh(user)
+    assert user.hashed_password == legacy_hash
@@ -83,3 +83,151 @@ def test_course_content_flow(client, db):
     # 9. Verify deletion
     verify_response = client.get(f"/api/v1/content/courses/{course.id}/modules", headers=headers)
     assert len(verify_response.json()) == 0
+
+
+def test_course_outline_in_two_queries_without_content(client, db, instructor_token, test_instructor):
+    from sqlalchemy import event
+    from tests.conftest import async_engine
+    from app.models.course import Course
+    from app.models.module import Module
+    from app.models.lesson import Lesson
+    
+    course = Course(title="Long Course", code="LONG101", capacity=10, instructor_id=test_instructor.id)
+    db.add(course)
+    db.commit()
+    for m in range(8):
+        module = Module(title=f"Module {m}", order=m, course_id=course.id)
+        db.add(module)
+        db.flush()
+        db.add_all([
+            Lesson(title=f"Lesson {m}.{l}", content_type="text", content_data="x" * 10000, order=l, module_id=module.id)
+            for l in range(5)
+        ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {instructor_token}"}
+    
+    statements = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        # Ignore the principal lookup for the token
+        if "FROM users" not in statement:
+            statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get(f"/api/v1/content/courses/{course.id}/outline", headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    
+    assert response.status_code == 200
+    outline = response.json()
+    assert [m["title"] for m in outline] == [f"Module {m}" for m in range(8)]
+    assert all(len(m["lessons"]) == 5 for m in outline)
+    assert "content_data" not in outline[0]["lessons"][0]
+    # Modules, then all their lessons; the bodies are never selected
+    assert len(statements) == 2
+    assert "content_data" not in statements[1]
+    
+    # The full module listing still carries the bodies
+    full = client.get(f"/api/v1/content/courses/{course.id}/modules", headers=headers).json()
+    assert full[0]["lessons"][0]["content_data"] == "x" * 10000
+
+
+def test_outline_cache_hits_skip_database_and_writes_invalidate(client, db, instructor_token, test_instructor):
+    from sqlalchemy import event
+    from tests.conftest import async_engine
+    from app.models.course import Course
+    from app.models.module import Module
+    from app.models.lesson import Lesson
+    
+    course = Course(title="Cached Course", code="CACHE101", capacity=10, instructor_id=test_instructor.id)
+    db.add(course)
+    db.commit()
+    module = Module(title="Week 1", order=1, course_id=course.id)
+    db.add(module)
+    db.commit()
+    lesson = Lesson(title="Welcome", content_type="text", content_data="v1", module_id=module.id)
+    db.add(lesson)
+    db.commit()
+    headers = {"Authorization": f"Bearer {instructor_token}"}
+    url = f"/api/v1/content/courses/{course.id}/modules"
+    
+    assert client.get(url, headers=headers).json()[0]["lessons"][0]["content_data"] == "v1"
+    
+    statements = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" not in statement:
+            statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    try:
+        cached = client.get(url, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record_statement)
+    assert cached.json()[0]["lessons"][0]["content_data"] == "v1"
+    assert statements == []
+    
+    # Each write handler bumps the course's content version
+    response = client.patch(f"/api/v1/content/lessons/{lesson.id}", json={"content_data": "v2"}, headers=headers)
+    assert response.status_code == 200
+    assert client.get(url, headers=headers).json()[0]["lessons"][0]["content_data"] == "v2"
+    
+    response = client.post(
+        "/api/v1/content/modules",
+        json={"title": "Week 2", "order": 2, "course_id": str(course.id)},
+        headers=headers
+    )
+    assert response.status_code == 201
+    outline = client.get(f"/api/v1/content/courses/{course.id}/outline", headers=headers).json()
+    assert [m["title"] for m in outline] == ["Week 1", "Week 2"]
+    
+    client.delete(f"/api/v1/content/modules/{module.id}", headers=headers)
+    assert [m["title"] for m in client.get(url, headers=headers).json()] == ["Week 2"]
+
+
+def test_lesson_requires_enrollment(client, db, student_token, test_student, test_instructor):
+    from app.models.course import Course
+    from app.models.module import Module
+    from app.models.lesson import Lesson
+    from app.models.enrollment import Enrollment
+    
+    course = Course(title="Private Course", code="PRIV101", capacity=10, instructor_id=test_instructor.id)
+    db.add(course)
+    db.commit()
+    module = Module(title="Week 1", order=1, course_id=course.id)
+    db.add(module)
+    db.commit()
+    lesson = Lesson(title="Secret", content_type="text", content_data="answers", module_id=module.id)
+    db.add(lesson)
+    db.commit()
+    headers = {"Authorization": f"Bearer {student_token}"}
+    url = f"/api/v1/content/lessons/{lesson.id}"
+    
+    response = client.get(url, headers=headers)
+    assert response.status_code == 403
+    
+    db.add(Enrollment(user_id=test_student.id, course_id=course.id))
+    db.commit()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["content_data"] == "answers"
+
+
+def test_outline_cache_has_no_version_while_redis_is_down():
+    import asyncio
+    import uuid
+    import redis
+    from app.core.outline_cache import OutlineCache
+    
+    class UnreachableRedis:
+        async def get(self, key):
+            raise redis.ConnectionError("connection refused")
+    
+    cache = OutlineCache(maxsize=10, ttl=60)
+    course_id = uuid.uuid4()
+    cache.bump(course_id)
+    assert asyncio.run(cache.current_version(course_id)) == 1
+    
+    # The local counter would alias entries stored under Redis versions
+    cache._aioredis = UnreachableRedis()
+    assert asyncio.run(cache.current_version(course_id)) is None
+    assert cache.stats()["redis_errors"] == 1
@@ -164,4 +164,84 @@ def test_delete_course_as_admin(client, admin_token, db):
     
     assert response.status_code == 200
     data = response.json()
-    assert data["is_active"] == False
\ No newline at end of file
+    assert data["is_active"] == False
+
+def test_course_list_counts_without_extra_queries(client, db, test_student):
+    from sqlalchemy import event
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment
+    from app.models.waitlist import WaitlistEntry
+    from tests.conftest import async_engine
+    
+    courses = [Course(title=f"Course {i}", code=f"BATCH{i}", capacity=30, is_active=True) for i in range(10)]
+    db.add_all(courses)
+    db.commit()
+    
+    db.add(Enrollment(user_id=test_student.id, course_id=courses[0].id))
+    db.add(WaitlistEntry(user_id=test_student.id, course_id=courses[1].id))
+    db.commit()
+    
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/api/v1/courses/")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    
+    assert response.status_code == 200
+    data = {c["code"]: c for c in response.json()}
+    assert data["BATCH0"]["enrollment_count"] == 1
+    assert data["BATCH1"]["waitlist_count"] == 1
+    assert data["BATCH2"]["enrollment_count"] == 0
+    # Counts come from the denormalized columns on the page query itself;
+    # the only other statement is the fixed-cost ETag aggregate
+    assert len(statements) == 2
+    assert not any("enrollments" in s or "waitlist_entries" in s for s in statements)
+
+
+def test_course_search_is_ranked_and_paginated(client, db):
+    from app.models.course import Course
+    db.add_all([
+        Course(title="Data Structures", code="CS201", capacity=30, is_active=True,
+               description="Lists, trees and graphs implemented in Python"),
+        Course(title="Python Programming", code="CS101", capacity=30, is_active=True,
+               category="Programming"),
+        Course(title="Pottery", code="ART110", capacity=10, is_active=True),
+        Course(title="Python for Retired Courses", code="OLD100", capacity=10, is_active=False),
+    ])
+    db.commit()
+    
+    # Title matches outrank description-only matches; inactive courses are excluded
+    response = client.get("/api/v1/courses/?search=python")
+    assert [c["code"] for c in response.json()] == ["CS101", "CS201"]
+    
+    # Prefix match on the last term, for search-as-you-type
+    assert [c["code"] for c in client.get("/api/v1/courses/?search=pyth").json()] == ["CS101", "CS201"]
+    
+    # Every term must match; operators typed into the box are ignored
+    assert [c["code"] for c in client.get("/api/v1/courses/?search=python%20trees").json()] == ["CS201"]
+    assert client.get('/api/v1/courses/?search="python" OR (pottery*').status_code == 200
+    
+    # Pagination applies after ranking
+    page = client.get("/api/v1/courses/?search=python&skip=1&limit=1").json()
+    assert [c["code"] for c in page] == ["CS201"]
+
+
+def test_course_search_index_follows_updates(client, db):
+    from app.models.course import Course
+    course = Course(title="Watercolour", code="ART120", capacity=10, is_active=True)
+    db.add(course)
+    db.commit()
+    
+    course.title = "Oil Painting"
+    db.commit()
+    
+    assert client.get("/api/v1/courses/?search=watercolour").json() == []
+    assert [c["code"] for c in client.get("/api/v1/courses/?search=painting").json()] == ["ART120"]
+    
+    db.delete(course)
+    db.commit()
+    assert client.get("/api/v1/courses/?search=painting").json() == []
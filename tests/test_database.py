@@ -0,0 +1,40 @@
+import pytest
+from app.database import to_async_url
+
+
+def test_to_async_url_maps_sync_drivers():
+    assert to_async_url("postgresql://user:pw@localhost:5432/course_db").drivername == "postgresql+asyncpg"
+    assert to_async_url("postgresql+psycopg2://user:pw@localhost/course_db").drivername == "postgresql+asyncpg"
+    assert to_async_url("sqlite:///./course_enrollment.db").drivername == "sqlite+aiosqlite"
+
+
+def test_to_async_url_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        to_async_url("mysql://user:pw@localhost/course_db")
+
+
+def test_instrumented_pool_counts_checkouts_and_timeouts():
+    from sqlalchemy import create_engine, exc
+    from app.database import InstrumentedQueuePool, POOL_STATS, pool_status
+    
+    engine = create_engine(
+        "sqlite:///./test.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+        pool_logging_name="test-timeouts",
+    )
+    try:
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+            status = pool_status(engine.pool, "test-timeouts")
+            assert status["checked_out"] == 1
+        
+        stats = POOL_STATS["test-timeouts"].snapshot()
+        assert stats["checkouts"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_max_ms"] >= 50
+    finally:
+        engine.dispose()
@@ -0,0 +1,69 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.main import app
+from app.database import get_db
+from app.config import settings
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.user import User, UserRole
+from app.core.security import create_access_token
+from tests.conftest import TestingSessionLocal
+
+
+CAPACITY = 25
+STUDENTS = 200
+
+
+@pytest.fixture
+def session_per_request(client):
+    # Concurrent requests cannot share the test session, give each its own
+    def override_get_db():
+        database = TestingSessionLocal()
+        try:
+            yield database
+        finally:
+            database.close()
+    
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+
+
+def test_parallel_enrollments_never_overbook(client, db, session_per_request, monkeypatch):
+    # SQLite ignores FOR UPDATE, so only the conditional strategy is race-safe on the test backend
+    monkeypatch.setattr(settings, "ENROLLMENT_SEAT_STRATEGY", "conditional")
+    
+    course = Course(title="Hot Course", code="HOT101", capacity=CAPACITY, is_active=True)
+    students = [
+        User(
+            email=f"burst{i}@test.com",
+            name=f"Burst Student {i}",
+            hashed_password="not-used",
+            role=UserRole.STUDENT,
+            is_active=True
+        )
+        for i in range(STUDENTS)
+    ]
+    db.add(course)
+    db.add_all(students)
+    db.commit()
+    
+    course_id = str(course.id)
+    tokens = [create_access_token({"sub": str(s.id), "role": s.role.value}) for s in students]
+    
+    def enroll(token):
+        return client.post(
+            "/api/v1/enrollments/",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"course_id": course_id}
+        )
+    
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        responses = list(pool.map(enroll, tokens))
+    
+    codes = [r.status_code for r in responses]
+    assert set(codes) <= {201, 400}
+    assert codes.count(201) == CAPACITY
+    
+    db.expire_all()
+    assert db.query(Enrollment).filter(Enrollment.course_id == course.id).count() == CAPACITY
+    assert db.get(Course, course.id).enrolled_count == CAPACITY
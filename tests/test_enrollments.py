@@ -198,4 +198,101 @@ def test_admin_remove_student_from_course(client, admin_token, db, test_student)
         headers={"Authorization": f"Bearer {admin_token}"}
     )
     
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+def test_admin_export_streams_enrollments(client, admin_token, db):
+    import csv
+    import io
+    import json
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment, EnrollmentStatus
+    from app.models.user import User, UserRole
+    
+    course = Course(title="Exported Course", code="EXP101", capacity=50, is_active=True)
+    other = Course(title="Other Course", code="EXP102", capacity=50, is_active=True)
+    db.add_all([course, other])
+    db.commit()
+    students = [
+        User(email=f"export{i}@test.com", name=f"Export {i}", hashed_password="x", role=UserRole.STUDENT)
+        for i in range(3)
+    ]
+    db.add_all(students)
+    db.commit()
+    db.add_all([
+        Enrollment(user_id=students[0].id, course_id=course.id),
+        Enrollment(user_id=students[1].id, course_id=course.id, status=EnrollmentStatus.COMPLETED, grade="A"),
+        Enrollment(user_id=students[2].id, course_id=other.id),
+    ])
+    db.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    response = client.get("/api/v1/enrollments/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 3
+    assert {r["user_email"] for r in records} == {s.email for s in students}
+    
+    response = client.get(
+        "/api/v1/enrollments/export",
+        params={"format": "csv", "course_id": str(course.id), "status": "completed"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["course_code"] == "EXP101"
+    assert rows[0]["status"] == "completed"
+    assert rows[0]["grade"] == "A"
+
+
+def test_export_requires_admin(client, student_token):
+    response = client.get(
+        "/api/v1/enrollments/export",
+        headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert response.status_code == 403
+
+
+def test_enrollment_listings_load_details_eagerly(client, admin_token, db, no_lazy_loads):
+    from sqlalchemy import event
+    from tests.conftest import engine
+    from app.models.course import Course
+    from app.models.enrollment import Enrollment
+    from app.models.user import User, UserRole
+    
+    course = Course(title="Eager Course", code="EAG101", capacity=50, is_active=True)
+    db.add(course)
+    db.commit()
+    students = [
+        User(email=f"eager{i}@test.com", name=f"Eager {i}", hashed_password="x", role=UserRole.STUDENT)
+        for i in range(10)
+    ]
+    db.add_all(students)
+    db.commit()
+    db.add_all([Enrollment(user_id=s.id, course_id=course.id) for s in students])
+    db.commit()
+    course_id = course.id
+    emails = {s.email for s in students}
+    # Start from an empty identity map, as a real request would
+    db.expunge_all()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        all_response = client.get("/api/v1/enrollments/", headers=headers)
+        course_response = client.get(f"/api/v1/enrollments/course/{course_id}/all", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    
+    assert len(all_response.json()) == 10
+    assert len(course_response.json()) == 10
+    assert {e["user"]["email"] for e in course_response.json()} == emails
+    # One query per page (plus the course lookup), however many rows are on it
+    assert len(statements) <= 3
@@ -0,0 +1,131 @@
+from sqlalchemy import event
+
+from app.core.catalog_cache import catalog_cache
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.module import Module
+from app.models.lesson import Lesson
+
+
+def _revalidate(client, url, etag, headers=None):
+    return client.get(url, headers={**(headers or {}), "If-None-Match": etag})
+
+
+def test_course_detail_and_catalog_conditional_get(client, db, admin_token, test_student):
+    course = Course(title="Cacheable", code="ETAG101", capacity=10, is_active=True)
+    db.add(course)
+    db.commit()
+    detail_url = f"/api/v1/courses/{course.id}"
+
+    response = client.get(detail_url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert response.headers["Cache-Control"] == "public, no-cache"
+
+    not_modified = _revalidate(client, detail_url, etag)
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    catalog = client.get("/api/v1/courses/")
+    catalog_etag = catalog.headers["ETag"]
+    assert _revalidate(client, "/api/v1/courses/", catalog_etag).status_code == 304
+
+    # A counter change alters the representation, so the validators change with it
+    db.add(Enrollment(user_id=test_student.id, course_id=course.id))
+    db.commit()
+    response = _revalidate(client, detail_url, etag)
+    assert response.status_code == 200
+    assert response.json()["enrollment_count"] == 1
+    # The catalog picks counter changes up once its cached page expires
+    assert _revalidate(client, "/api/v1/courses/", catalog_etag).status_code == 304
+    catalog_cache.clear()
+    assert _revalidate(client, "/api/v1/courses/", catalog_etag).status_code == 200
+
+    # So does an edit through the API
+    etag = response.headers["ETag"]
+    client.put(detail_url, json={"title": "Renamed"}, headers={"Authorization": f"Bearer {admin_token}"})
+    response = _revalidate(client, detail_url, etag)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+
+
+def test_outline_and_lesson_conditional_get(client, db, instructor_token, test_instructor):
+    course = Course(title="Content ETags", code="ETAG201", capacity=10, instructor_id=test_instructor.id)
+    db.add(course)
+    db.commit()
+    module = Module(title="Week 1", order=1, course_id=course.id)
+    db.add(module)
+    db.commit()
+    lesson = Lesson(title="Intro", content_type="text", content_data="v1", module_id=module.id)
+    db.add(lesson)
+    db.commit()
+    headers = {"Authorization": f"Bearer {instructor_token}"}
+    outline_url = f"/api/v1/content/courses/{course.id}/outline"
+    lesson_url = f"/api/v1/content/lessons/{lesson.id}"
+
+    outline = client.get(outline_url, headers=headers)
+    assert outline.headers["Cache-Control"] == "private, no-cache"
+    assert _revalidate(client, outline_url, outline.headers["ETag"], headers).status_code == 304
+
+    lesson_response = client.get(lesson_url, headers=headers)
+    lesson_etag = lesson_response.headers["ETag"]
+    assert _revalidate(client, lesson_url, lesson_etag, headers).status_code == 304
+
+    client.patch(lesson_url, json={"title": "Introduction", "content_data": "v2"}, headers=headers)
+    assert _revalidate(client, outline_url, outline.headers["ETag"], headers).status_code == 200
+    response = _revalidate(client, lesson_url, lesson_etag, headers)
+    assert response.status_code == 200
+    assert response.json()["content_data"] == "v2"
+
+
+def test_catalog_pages_are_cached_until_a_write_commits(client, db, test_student):
+    from tests.conftest import async_engine
+
+    db.add(Course(title="Python Basics", code="CAT101", capacity=10, is_active=True))
+    db.commit()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        first = client.get("/api/v1/courses/", params={"search": "Python"})
+        loaded = len(statements)
+        # Same page, differently spelled: served from the cache without touching the database
+        second = client.get("/api/v1/courses/", params={"search": "  python "})
+        assert len(statements) == loaded
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count_statement)
+
+    assert loaded > 0
+    assert second.content == first.content
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    # Counter changes wait for the TTL rather than emptying the cache on every enrollment
+    course = db.query(Course).filter(Course.code == "CAT101").one()
+    db.add(Enrollment(user_id=test_student.id, course_id=course.id))
+    db.commit()
+    response = client.get("/api/v1/courses/", params={"search": "python"})
+    assert response.headers["ETag"] == first.headers["ETag"]
+
+    # Committing a course write invalidates every cached page
+    course.description = "Now with counters"
+    db.commit()
+    response = client.get("/api/v1/courses/", params={"search": "python"})
+    assert response.json()[0]["enrollment_count"] == 1
+    assert response.headers["ETag"] != first.headers["ETag"]
+
+
+def test_catalog_cache_keeps_next_cursor(client, db):
+    for i in range(3):
+        db.add(Course(title=f"Course {i}", code=f"CUR10{i}", capacity=10, is_active=True))
+    db.commit()
+
+    first = client.get("/api/v1/courses/", params={"limit": 2})
+    cached = client.get("/api/v1/courses/", params={"limit": 2})
+    assert cached.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert catalog_cache.stats()["hits"] >= 1
+
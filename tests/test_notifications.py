@@ -0,0 +1,160 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.notifier import Event, NotificationDispatcher
+from app.crud.notification import notification_crud
+from app.models.course import Course
+from app.models.notification import Notification, NotificationKind, NotificationStatus
+from app.worker import NotificationWorker
+from tests.conftest import TestingSessionLocal
+
+
+class RecordingTransport:
+    """SMTP/HTTP stand-in: records connections and messages, optionally rejecting some recipients."""
+
+    def __init__(self, reject=(), fail_connect=False):
+        self.reject = set(reject)
+        self.fail_connect = fail_connect
+        self.connections = 0
+        self.sent = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        if self.fail_connect:
+            raise ConnectionError("smtp down")
+        self.connections += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def send(self, message):
+        if message.recipient in self.reject:
+            raise ValueError(f"rejected {message.recipient}")
+        self.sent.append(message)
+
+
+def _worker(transport, **kwargs):
+    options = dict(batch_size=10, max_attempts=3, retry_base_seconds=30, retry_max_seconds=3600, lease_seconds=300)
+    options.update(kwargs)
+    return NotificationWorker(session_factory=TestingSessionLocal, dispatcher=NotificationDispatcher(transport), **options)
+
+
+def test_enrollment_queues_notification_in_its_transaction(client, db, student_token, test_student):
+    course = Course(title="Queued Course", code="OUT101", capacity=10, is_active=True)
+    db.add(course)
+    db.commit()
+    headers = {"Authorization": f"Bearer {student_token}"}
+
+    response = client.post("/api/v1/enrollments/", json={"course_id": str(course.id)}, headers=headers)
+    assert response.status_code == 201
+    # A rejected request queues nothing
+    response = client.post("/api/v1/enrollments/", json={"course_id": str(course.id)}, headers=headers)
+    assert response.status_code == 400
+
+    queued = db.query(Notification).filter(Notification.kind == NotificationKind.ENROLLMENT).all()
+    assert len(queued) == 1
+    assert queued[0].recipient == test_student.email
+    assert queued[0].payload == {"course_title": "Queued Course"}
+    assert queued[0].status == NotificationStatus.PENDING
+
+
+def test_worker_delivers_pending_notifications(db):
+    notification_crud.enqueue(db, NotificationKind.WELCOME, recipient="a@test.com", user_name="A")
+    notification_crud.enqueue(db, NotificationKind.LOGIN, recipient="b@test.com", ip_address="10.0.0.1")
+    db.commit()
+    transport = RecordingTransport()
+
+    assert asyncio.run(_worker(transport).run_once()) == 2
+    assert sorted(message.recipient for message in transport.sent) == ["a@test.com", "b@test.com"]
+    assert transport.connections == 1
+    db.expire_all()
+    assert {n.status for n in db.query(Notification)} == {NotificationStatus.SENT}
+    # Nothing left to do
+    assert asyncio.run(_worker(transport).run_once()) == 0
+
+
+def test_failures_back_off_then_dead_letter(db):
+    notification = notification_crud.enqueue(db, NotificationKind.WELCOME, recipient="a@test.com", user_name="A")
+    db.commit()
+
+    worker = _worker(RecordingTransport(fail_connect=True))
+    delays = []
+    for attempt in range(1, 4):
+        before = datetime.utcnow()
+        assert asyncio.run(worker.run_once()) == 1
+        db.expire_all()
+        delays.append(notification.available_at - before)
+        assert notification.attempts == attempt
+        assert "smtp down" in notification.last_error
+        # Not due yet: a second poll finds nothing
+        assert asyncio.run(worker.run_once()) == 0
+        notification.available_at = datetime.utcnow()
+        db.commit()
+
+    assert notification.status == NotificationStatus.DEAD
+    assert timedelta(seconds=29) < delays[0] < timedelta(seconds=31)
+    assert timedelta(seconds=59) < delays[1] < timedelta(seconds=61)
+
+    assert notification_crud.requeue_dead(db) == 1
+    db.commit()
+    db.expire_all()
+    assert (notification.status, notification.attempts) == (NotificationStatus.PENDING, 0)
+
+
+def test_claimed_notifications_are_leased(db):
+    notification_crud.enqueue(db, NotificationKind.WELCOME, recipient="a@test.com", user_name="A")
+    db.commit()
+
+    claimed = notification_crud.claim_batch(db, batch_size=10, lease_seconds=300)
+    db.commit()
+    assert len(claimed) == 1
+    # Another worker polling meanwhile does not get the same row...
+    assert notification_crud.claim_batch(db, batch_size=10, lease_seconds=300) == []
+    # ...until the lease runs out (the first worker died without recording a result)
+    later = datetime.utcnow() + timedelta(seconds=301)
+    assert len(notification_crud.claim_batch(db, batch_size=10, lease_seconds=300, now=later)) == 1
+
+
+def _event(kind, recipient, **payload):
+    return Event(uuid.uuid4(), kind, recipient, payload)
+
+
+def test_dispatcher_merges_events_per_recipient():
+    events = [
+        _event(NotificationKind.LOGIN, "a@test.com", ip_address="10.0.0.1"),
+        _event(NotificationKind.ENROLLMENT, "b@test.com", course_title="Algebra"),
+        _event(NotificationKind.ENROLLMENT, "a@test.com", course_title="Physics"),
+    ]
+    transport = RecordingTransport()
+    dispatcher = NotificationDispatcher(transport)
+
+    outcomes = asyncio.run(dispatcher.dispatch(events))
+
+    assert outcomes == {event.id: None for event in events}
+    assert transport.connections == 1
+    messages = {message.recipient: message for message in transport.sent}
+    assert len(transport.sent) == 2
+    # a@ gets one digest with both events, in the order they were queued
+    assert messages["a@test.com"].subject == "2 updates from LMS Pro"
+    assert messages["a@test.com"].body.splitlines() == [
+        "- NOTIFICATION: New login detected for a@test.com from IP: 10.0.0.1.",
+        "- NOTIFICATION: Enrollment successful! User a@test.com has enrolled in 'Physics'.",
+    ]
+    assert messages["b@test.com"].subject == "Enrollment confirmed"
+    assert dispatcher.stats() == {"batches": 1, "events": 3, "messages": 2}
+
+
+def test_dispatcher_fails_only_the_rejected_recipient():
+    ok = _event(NotificationKind.WELCOME, "ok@test.com", user_name="Ok")
+    bad = [_event(NotificationKind.LOGIN, "bad@test.com", ip_address=ip) for ip in ("1.1.1.1", "2.2.2.2")]
+    transport = RecordingTransport(reject={"bad@test.com"})
+
+    outcomes = asyncio.run(NotificationDispatcher(transport).dispatch([ok, *bad]))
+
+    assert outcomes[ok.id] is None
+    assert all(isinstance(outcomes[event.id], ValueError) for event in bad)
+    assert [message.recipient for message in transport.sent] == ["ok@test.com"]
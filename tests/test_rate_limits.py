@@ -0,0 +1,62 @@
+import uuid
+
+import pytest
+
+from app.core.limiter import limiter
+from app.core.security import create_access_token, get_password_hash
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def rate_limits():
+    # Limits are off under TESTING; switch them on (with fresh counters) for one test
+    limiter.reset()
+    limiter.enabled = True
+    yield limiter
+    limiter.enabled = False
+    limiter.reset()
+
+
+def _enroll(client, token):
+    return client.post(
+        "/api/v1/enrollments/",
+        json={"course_id": str(uuid.uuid4())},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def test_enrollment_limit_is_per_user(client, db, student_token, rate_limits):
+    other = User(
+        email="other@test.com",
+        name="Other Student",
+        hashed_password=get_password_hash("password123"),
+        role=UserRole.STUDENT,
+        is_active=True
+    )
+    db.add(other)
+    db.commit()
+    other_token = create_access_token({"sub": str(other.id), "role": other.role.value})
+
+    # 10/minute: rejected attempts count too
+    for _ in range(10):
+        assert _enroll(client, student_token).status_code == 404
+    assert _enroll(client, student_token).status_code == 429
+    # Same client IP, different user: separate budget
+    assert _enroll(client, other_token).status_code == 404
+
+
+def test_search_limit_only_counts_searches(client, rate_limits):
+    for _ in range(30):
+        assert client.get("/api/v1/courses/", params={"search": "python"}).status_code == 200
+    response = client.get("/api/v1/courses/", params={"search": "python"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    # Browsing the catalog is not a search
+    assert client.get("/api/v1/courses/").status_code == 200
+
+
+def test_login_limit_still_applies(client, test_student, rate_limits):
+    credentials = {"username": "teststudent@test.com", "password": "wrong"}
+    for _ in range(5):
+        assert client.post("/api/v1/auth/login", data=credentials).status_code == 401
+    assert client.post("/api/v1/auth/login", data=credentials).status_code == 429
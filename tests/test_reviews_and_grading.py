@@ -123,3 +123,74 @@ def test_review_uncompleted_course_fails(client, test_student, db):
     
     assert response.status_code == 400
     assert "only review courses you have completed" in response.json()["detail"]
+
+
+def _completed_enrollment(db, user, course):
+    from app.models.enrollment import Enrollment
+    enrollment = Enrollment(user_id=user.id, course_id=course.id, status=EnrollmentStatus.COMPLETED)
+    db.add(enrollment)
+    db.commit()
+    db.refresh(enrollment)
+    return enrollment
+
+
+def test_rating_aggregates_follow_reviews(client, test_student, db):
+    from app.models.review import Review
+    student_token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_student.email, "password": "password123"}
+    ).json()["access_token"]
+    
+    rated = Course(title="Rated Course", code="RATE101", capacity=30, is_active=True)
+    unrated = Course(title="Unrated Course", code="RATE102", capacity=30, is_active=True)
+    db.add_all([rated, unrated])
+    db.commit()
+    _completed_enrollment(db, test_student, rated)
+    
+    response = client.post(
+        f"/api/v1/reviews/{rated.id}",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={"rating": 4, "comment": "Solid"}
+    )
+    assert response.status_code == 201
+    db.refresh(rated)
+    assert (rated.rating_sum, rated.rating_count, rated.average_rating) == (4, 1, 4.0)
+    
+    # min_rating filters on the stored average; unreviewed courses never match
+    codes = [c["code"] for c in client.get("/api/v1/courses/?min_rating=3.5").json()]
+    assert codes == ["RATE101"]
+    assert client.get("/api/v1/courses/?min_rating=4.5").json() == []
+    
+    review = db.query(Review).filter(Review.course_id == rated.id).one()
+    review.rating = 2
+    db.commit()
+    db.refresh(rated)
+    assert (rated.rating_sum, rated.rating_count, rated.average_rating) == (2, 1, 2.0)
+    
+    db.delete(review)
+    db.commit()
+    db.refresh(rated)
+    assert (rated.rating_sum, rated.rating_count, rated.average_rating) == (0, 0, None)
+
+
+def test_rebuild_rating_stats(db, test_student, test_instructor):
+    from app.models.review import Review
+    from app.crud.course import course_crud
+    course = Course(title="Drifted Ratings", code="RATE201", capacity=30)
+    db.add(course)
+    db.commit()
+    for user, rating in ((test_student, 5), (test_instructor, 2)):
+        enrollment = _completed_enrollment(db, user, course)
+        db.add(Review(user_id=user.id, course_id=course.id, enrollment_id=enrollment.id, rating=rating))
+    db.commit()
+    db.refresh(course)
+    assert (course.rating_sum, course.rating_count, course.average_rating) == (7, 2, 3.5)
+    
+    # Simulate drift, e.g. from a bulk import that bypassed the ORM
+    course.rating_sum, course.rating_count, course.average_rating = 0, 0, None
+    db.commit()
+    
+    assert course_crud.rebuild_rating_stats(db) >= 1
+    db.commit()
+    db.refresh(course)
+    assert (course.rating_sum, course.rating_count, course.average_rating) == (7, 2, 3.5)
@@ -0,0 +1,93 @@
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.waitlist import WaitlistEntry
+from app.models.user import User, UserRole
+from app.crud.course import course_crud
+from app.core.security import get_password_hash
+
+
+def test_counters_follow_enroll_and_deregister(client, student_token, db, test_student):
+    course = Course(title="Counted Course", code="CNT101", capacity=2, is_active=True)
+    db.add(course)
+    db.commit()
+    db.refresh(course)
+    assert course.enrolled_count == 0
+    assert course.waitlist_count == 0
+
+    response = client.post(
+        "/api/v1/enrollments/",
+        headers={"Authorization": f"Bearer {student_token}"},
+        json={"course_id": str(course.id)}
+    )
+    assert response.status_code == 201
+    enrollment_id = response.json()["id"]
+
+    db.refresh(course)
+    assert course.enrolled_count == 1
+
+    response = client.delete(
+        f"/api/v1/enrollments/{enrollment_id}",
+        headers={"Authorization": f"Bearer {student_token}"}
+    )
+    assert response.status_code == 200
+
+    db.refresh(course)
+    assert course.enrolled_count == 0
+
+
+def test_counters_follow_waitlist_promotion(client, admin_token, student_token, db, test_student):
+    course = Course(title="Tiny Course", code="TINY101", capacity=1, is_active=True)
+    other = User(
+        email="waiting@test.com",
+        name="Waiting Student",
+        hashed_password=get_password_hash("password123"),
+        role=UserRole.STUDENT,
+        is_active=True
+    )
+    db.add_all([course, other])
+    db.commit()
+
+    enrollment = Enrollment(user_id=test_student.id, course_id=course.id)
+    db.add(enrollment)
+    db.add(WaitlistEntry(user_id=other.id, course_id=course.id))
+    db.commit()
+
+    db.refresh(course)
+    assert (course.enrolled_count, course.waitlist_count) == (1, 1)
+
+    response = client.delete(
+        f"/api/v1/enrollments/admin/{enrollment.id}",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert response.status_code == 200
+
+    db.refresh(course)
+    assert (course.enrolled_count, course.waitlist_count) == (1, 0)
+
+    course_response = client.get(f"/api/v1/courses/{course.id}")
+    assert course_response.json()["enrollment_count"] == 1
+    assert course_response.json()["waitlist_count"] == 0
+
+
+def test_reconcile_seat_counters(db, test_student):
+    course = Course(title="Drifted Course", code="DRIFT101", capacity=10, is_active=True)
+    db.add(course)
+    db.commit()
+    db.add(Enrollment(user_id=test_student.id, course_id=course.id))
+    db.commit()
+
+    # Simulate drift, e.g. from a bulk import that bypassed the ORM
+    course.enrolled_count = 5
+    course.waitlist_count = 2
+    db.commit()
+
+    drift = course_crud.reconcile_seat_counters(db)
+    assert len(drift) == 1
+    assert drift[0]["stored"] == (5, 2)
+    assert drift[0]["actual"] == (1, 0)
+
+    course_crud.reconcile_seat_counters(db, repair=True)
+    db.commit()
+    db.refresh(course)
+    assert (course.enrolled_count, course.waitlist_count) == (1, 0)
+    assert course_crud.reconcile_seat_counters(db) == []
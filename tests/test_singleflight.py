@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.core.singleflight import SingleFlight, course_flights
+from app.models.course import Course
+
+
+def test_single_flight_coalesces_concurrent_loads():
+    flights = SingleFlight()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "page"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("key", loader) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["page"] * 5
+    assert len(calls) == 1
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "followers": 4}
+
+
+def test_coalesce_decorator_keys_on_arguments_and_shares_errors():
+    flights = SingleFlight()
+    calls = []
+
+    @flights.coalesce(key=lambda session, course_id: course_id)
+    async def load(session, course_id):
+        calls.append((session, course_id))
+        await asyncio.sleep(0.01)
+        if course_id == "missing":
+            raise LookupError(course_id)
+        return course_id.upper()
+
+    async def run():
+        # Different sessions, same key: one call. A different key runs separately
+        return await asyncio.gather(
+            load("s1", course_id="a"),
+            load("s2", course_id="a"),
+            load("s3", course_id="b"),
+            load("s4", course_id="missing"),
+            load("s5", course_id="missing"),
+            return_exceptions=True,
+        )
+
+    a1, a2, b, missing1, missing2 = asyncio.run(run())
+    assert (a1, a2, b) == ("A", "A", "B")
+    assert isinstance(missing1, LookupError) and isinstance(missing2, LookupError)
+    assert sorted(course_id for _, course_id in calls) == ["a", "b", "missing"]
+    assert flights.stats()["followers"] == 2
+
+
+def test_single_flight_follower_takes_over_from_cancelled_leader():
+    flights = SingleFlight()
+    started = []
+
+    async def loader():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return len(started)
+
+    async def run():
+        leader = asyncio.create_task(flights.do("key", loader))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == 2
+
+
+def test_concurrent_course_requests_share_loads(client, db):
+    course = Course(title="Popular", code="HOT101", capacity=10, is_active=True)
+    db.add(course)
+    db.commit()
+    before = course_flights.stats()
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get(f"/api/v1/courses/{course.id}") for _ in range(10)))
+
+    responses = asyncio.run(run())
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+
+    after = course_flights.stats()
+    # Each request makes two coalesced calls (ETag, then body); each either led or followed
+    calls = (after["leaders"] - before["leaders"]) + (after["followers"] - before["followers"])
+    assert calls == 20
+    assert after["followers"] > before["followers"]
+    assert after["in_flight"] == 0
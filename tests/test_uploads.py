@@ -0,0 +1,239 @@
+import os
+import uuid
+from io import BytesIO
+
+import pytest
+
+from app.config import settings
+from app.models.upload import StoredFile, Upload
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    monkeypatch.setattr(settings, "UPLOAD_STAGING_DIR", str(tmp_path / "staging"))
+    return tmp_path / "uploads"
+
+
+@pytest.fixture
+def staging_dir(upload_dir):
+    return upload_dir.parent / "staging"
+
+
+def _upload(client, token, content, filename="lecture.mp4"):
+    return client.post(
+        "/api/v1/content/upload",
+        headers={"Authorization": f"Bearer {token}"},
+        files={"file": (filename, BytesIO(content), "video/mp4")}
+    )
+
+
+def test_identical_uploads_are_stored_once(client, db, instructor_token, admin_token, upload_dir, staging_dir):
+    content = os.urandom(3 * 1024 * 1024 + 17)  # spans several chunks
+
+    first = _upload(client, instructor_token, content)
+    second = _upload(client, admin_token, content, filename="copy.MP4")
+    assert first.status_code == second.status_code == 201
+    first, second = first.json(), second.json()
+
+    # Same content, same address; each upload still gets its own id
+    assert first["url"] == second["url"] == f"/uploads/{first['sha256'][:2]}/{first['sha256'][2:4]}/{first['sha256']}.mp4"
+    assert first["id"] != second["id"]
+    assert first["size"] == len(content)
+    stored = upload_dir / first["url"].removeprefix("/uploads/")
+    assert stored.read_bytes() == content
+    assert db.get(StoredFile, first["sha256"]).ref_count == 2
+    # No temporary copies are left behind
+    assert list((staging_dir / "incoming").iterdir()) == []
+
+    # The content outlives the first deletion...
+    response = client.delete(f"/api/v1/content/uploads/{first['id']}", headers={"Authorization": f"Bearer {instructor_token}"})
+    assert response.status_code == 204
+    db.expire_all()
+    assert db.get(StoredFile, first["sha256"]).ref_count == 1
+    assert stored.exists()
+
+    # ...and goes with the last one
+    response = client.delete(f"/api/v1/content/uploads/{second['id']}", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 204
+    db.expire_all()
+    assert db.get(StoredFile, first["sha256"]) is None
+    assert not stored.exists()
+
+
+def test_upload_over_the_limit_is_rejected(client, db, instructor_token, upload_dir, staging_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 1024)
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_SIZE", 256)
+
+    response = _upload(client, instructor_token, b"x" * 1025)
+    assert response.status_code == 413
+    assert db.query(Upload).count() == 0
+    assert list((staging_dir / "incoming").iterdir()) == []
+
+    assert _upload(client, instructor_token, b"x" * 1024).status_code == 201
+
+
+def test_only_the_uploader_or_an_admin_can_delete(client, db, instructor_token, test_instructor, upload_dir):
+    from app.core.security import create_access_token, get_password_hash
+    from app.models.user import User, UserRole
+
+    other = User(
+        email="other.instructor@test.com",
+        name="Other Instructor",
+        hashed_password=get_password_hash("password123"),
+        role=UserRole.INSTRUCTOR,
+        is_active=True
+    )
+    db.add(other)
+    db.commit()
+    other_token = create_access_token({"sub": str(other.id), "role": other.role.value})
+
+    upload_id = _upload(client, instructor_token, b"syllabus").json()["id"]
+    response = client.delete(f"/api/v1/content/uploads/{upload_id}", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.status_code == 403
+
+
+def _start_session(client, token, size, chunk_size=64 * 1024, filename="lecture.mp4"):
+    return client.post(
+        "/api/v1/content/uploads/sessions",
+        headers={"Authorization": f"Bearer {token}"},
+        json={"filename": filename, "size": size, "content_type": "video/mp4", "chunk_size": chunk_size}
+    )
+
+
+def _put_chunk(client, token, session_id, index, data):
+    return client.put(
+        f"/api/v1/content/uploads/sessions/{session_id}/chunks/{index}",
+        headers={"Authorization": f"Bearer {token}"},
+        content=data
+    )
+
+
+def test_resumable_upload_in_any_order(client, db, instructor_token, upload_dir, staging_dir):
+    chunk_size = 64 * 1024
+    content = os.urandom(4 * chunk_size + 100)
+    chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+    headers = {"Authorization": f"Bearer {instructor_token}"}
+
+    response = _start_session(client, instructor_token, len(content), chunk_size)
+    assert response.status_code == 201
+    session = response.json()
+    assert session["chunk_count"] == 5
+    assert session["received"] == []
+
+    # An interrupted client: a few chunks, out of order, one of them sent twice
+    for index in (4, 0, 1, 0):
+        assert _put_chunk(client, instructor_token, session["id"], index, chunks[index]).status_code == 204
+    response = client.get(f"/api/v1/content/uploads/sessions/{session['id']}", headers=headers)
+    assert response.json()["received"] == [[0, 1], [4, 4]]
+
+    # Completing now would lose data
+    response = client.post(f"/api/v1/content/uploads/sessions/{session['id']}/complete", headers=headers)
+    assert response.status_code == 409
+    assert "starting with chunk 2" in response.json()["detail"]
+
+    # Resume with what is missing
+    for index in (2, 3):
+        assert _put_chunk(client, instructor_token, session["id"], index, chunks[index]).status_code == 204
+    response = client.post(f"/api/v1/content/uploads/sessions/{session['id']}/complete", headers=headers)
+    assert response.status_code == 201
+    upload = response.json()
+    assert upload["size"] == len(content)
+    assert (upload_dir / upload["url"].removeprefix("/uploads/")).read_bytes() == content
+    assert list((staging_dir / "sessions").iterdir()) == []
+
+    # Same content address as a single-request upload of the same bytes
+    assert _upload(client, instructor_token, content).json()["url"] == upload["url"]
+    db.expire_all()
+    assert db.get(StoredFile, upload["sha256"]).ref_count == 2
+
+    # The session is gone once completed
+    response = client.get(f"/api/v1/content/uploads/sessions/{session['id']}", headers=headers)
+    assert response.status_code == 404
+
+
+def test_chunk_of_the_wrong_size_is_rejected(client, db, instructor_token, upload_dir):
+    chunk_size = 64 * 1024
+    session_id = _start_session(client, instructor_token, chunk_size + 10, chunk_size).json()["id"]
+
+    assert _put_chunk(client, instructor_token, session_id, 0, b"x" * (chunk_size - 1)).status_code == 400
+    assert _put_chunk(client, instructor_token, session_id, 1, b"x" * 11).status_code == 400
+    assert _put_chunk(client, instructor_token, session_id, 2, b"x" * 10).status_code == 400
+    # Short last chunk is fine
+    assert _put_chunk(client, instructor_token, session_id, 1, b"x" * 10).status_code == 204
+
+    response = client.get(
+        f"/api/v1/content/uploads/sessions/{session_id}",
+        headers={"Authorization": f"Bearer {instructor_token}"}
+    )
+    assert response.json()["received"] == [[1, 1]]
+
+
+def test_session_over_the_limit_is_rejected(client, db, instructor_token, upload_dir, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_MAX_BYTES", 1024 * 1024)
+    assert _start_session(client, instructor_token, 1024 * 1024 + 1).status_code == 413
+    assert _start_session(client, instructor_token, 1024 * 1024).status_code == 201
+
+
+def test_gc_removes_idle_sessions_and_leftovers(client, db, instructor_token, upload_dir, staging_dir, monkeypatch):
+    from datetime import datetime, timedelta
+    from app import manage
+    from app.models.upload import UploadSession
+    from tests.conftest import TestingSessionLocal
+
+    monkeypatch.setattr(manage, "SessionLocal", TestingSessionLocal)
+    chunk_size = 64 * 1024
+    idle_id = _start_session(client, instructor_token, 2 * chunk_size, chunk_size).json()["id"]
+    active_id = _start_session(client, instructor_token, 2 * chunk_size, chunk_size).json()["id"]
+    for session_id in (idle_id, active_id):
+        assert _put_chunk(client, instructor_token, session_id, 0, b"x" * chunk_size).status_code == 204
+
+    db.query(UploadSession).filter(UploadSession.id == uuid.UUID(idle_id)).update(
+        {"updated_at": datetime.utcnow() - timedelta(seconds=settings.UPLOAD_SESSION_TTL_SECONDS + 60)}
+    )
+    db.commit()
+    # A staged file from an upload that died mid-request
+    stale = staging_dir / "incoming" / "abandoned.part"
+    stale.parent.mkdir(parents=True, exist_ok=True)
+    stale.write_bytes(b"partial")
+    old = datetime.now().timestamp() - settings.UPLOAD_SESSION_TTL_SECONDS - 60
+    os.utime(stale, (old, old))
+    # A published file whose row never committed, next to one that did
+    orphan = upload_dir / "ab" / "cd" / ("abcd" + "0" * 60)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"orphan")
+    os.utime(orphan, (old, old))
+    kept = upload_dir / _upload(client, instructor_token, b"kept").json()["url"].removeprefix("/uploads/")
+    os.utime(kept, (old, old))
+    # Saved before content addressing, with no stored_files row
+    legacy = upload_dir / f"{uuid.uuid4()}.pdf"
+    legacy.write_bytes(b"legacy syllabus")
+    os.utime(legacy, (old, old))
+
+    assert manage.main(["gc-uploads"]) == 0
+
+    db.expire_all()
+    assert db.get(UploadSession, uuid.UUID(idle_id)) is None
+    assert db.get(UploadSession, uuid.UUID(active_id)) is not None
+    assert [entry.name for entry in (staging_dir / "sessions").iterdir()] == [active_id]
+    assert not stale.exists()
+    assert not orphan.exists()
+    assert kept.read_bytes() == b"kept"
+    assert legacy.read_bytes() == b"legacy syllabus"
+
+
+def test_reupload_after_last_reference_is_deleted(client, db, instructor_token, upload_dir, staging_dir):
+    headers = {"Authorization": f"Bearer {instructor_token}"}
+    first = _upload(client, instructor_token, b"handout").json()
+    stored = upload_dir / first["url"].removeprefix("/uploads/")
+    assert client.delete(f"/api/v1/content/uploads/{first['id']}", headers=headers).status_code == 204
+    assert not stored.exists()
+    assert list((staging_dir / "retired").iterdir()) == []
+
+    # The content comes back as a fresh stored file
+    second = _upload(client, instructor_token, b"handout")
+    assert second.status_code == 201
+    assert second.json()["url"] == first["url"]
+    assert stored.read_bytes() == b"handout"
+    db.expire_all()
+    assert db.get(StoredFile, first["sha256"]).ref_count == 1
@@ -24,4 +24,62 @@ def test_get_current_user_invalid_token(client):
         headers={"Authorization": "Bearer fake-invalid-token"}
     )
     
-    assert response.status_code == 401
\ No newline at end of file
+    assert response.status_code == 401
+
+def test_principal_cache_serves_repeat_requests(client, student_token, test_student):
+    from app.core.principal import principal_cache
+    
+    headers = {"Authorization": f"Bearer {student_token}"}
+    client.get("/api/v1/users/me", headers=headers)
+    hits_before = principal_cache.hits
+    
+    response = client.get("/api/v1/users/me", headers=headers)
+    
+    assert response.status_code == 200
+    assert principal_cache.hits == hits_before + 1
+
+
+def test_profile_update_invalidates_cached_principal(client, student_token):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    client.get("/api/v1/users/me", headers=headers)
+    
+    response = client.patch("/api/v1/users/me", headers=headers, json={"name": "Renamed Student"})
+    assert response.status_code == 200
+    
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["name"] == "Renamed Student"
+
+
+def test_deactivated_user_is_not_served_from_cache(client, student_token, test_student, db):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    
+    test_student.is_active = False
+    db.commit()
+    
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 400
+    assert "inactive" in response.json()["detail"].lower()
+
+
+def test_system_stats_admin_only(client, admin_token, student_token):
+    response = client.get("/api/v1/system/stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+    assert {"hits", "misses", "size"} <= set(response.json()["principal_cache"])
+    assert {"checked_out", "overflow", "timeouts", "wait_avg_ms"} <= set(response.json()["db_pool"]["sync"])
+    
+    response = client.get("/api/v1/system/stats", headers={"Authorization": f"Bearer {student_token}"})
+    assert response.status_code == 403
+
+
+def test_principal_cached_before_commit_is_invalidated_by_it(client, student_token, test_student, db):
+    headers = {"Authorization": f"Bearer {student_token}"}
+    
+    # Flushed but not committed: a concurrent request still sees, and caches, the active user
+    test_student.is_active = False
+    db.flush()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    
+    db.commit()
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 400